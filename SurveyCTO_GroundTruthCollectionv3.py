@@ -5,50 +5,54 @@ import pandas as pd
 # from src.ground_truth.akvo_gt_check.gt_check_functions import (
 from gt_check_functions import (
 
-    create_gt_plotid, geom_from_scto_str)
+    create_gt_plotids, geom_from_scto_str, geoms_from_scto_str)
+
+
+def read_workbooks(files) -> list:
+    return [pd.read_excel(file, engine="calamine") for file in files]
 
 
 class SurveyCTO_GroundTruthCollectionv3:
-    def parse_plots(self, plot_dir):
-        files = plot_dir.glob("*.xlsx")
-        plots = []
-        for file in files:
-            plots.append(pd.read_excel(file))
+    def parse_plots(self, plot_dir, plots=None):
+        # plots: the workbooks already read by the caller, so parse_plots and
+        # parse_subplots can share one read of the same export
+        if plots is None:
+            plots = read_workbooks(plot_dir.glob("*.xlsx"))
         df = (
             pd.concat(plots)
             .dropna(subset=["gt_plot"])
             .reset_index()
             .assign(
-                plot_id=lambda x: x.apply(create_gt_plotid, axis=1),
-                enumerator=lambda x: x.apply(lambda row: f"{row.enumerator} ({row.enumerator_id})", axis=1),
+                plot_id=create_gt_plotids,
+                enumerator=lambda x: x.enumerator.astype(str) + " (" + x.enumerator_id.astype(str) + ")",
                 collection_date=lambda x: x.starttime.dt.strftime("%Y-%m-%d"),
                 device=lambda x: x.device_info.str.split("SurveyCTO").str[0]
             )
+            # keep only the output columns and the polygon string before
+            # building the geometries, instead of carrying the whole export
+            [["plot_id", "enumerator", "enumerator_id", "collection_date", "device", "gt_plot"]]
             .assign(
-                geometry=lambda x: x.apply(
-                    geom_from_scto_str,
-                    column="gt_plot",
-                    accuracy_m=10,
-                    axis=1,
-                )
+                geometry=lambda x: geoms_from_scto_str(x, "gt_plot", accuracy_m=10)
             )
-            .pipe(gpd.GeoDataFrame, crs=4326)[["plot_id", "enumerator", "enumerator_id", "collection_date", "device", "geometry"]]
+            .drop(columns="gt_plot")
+            .pipe(gpd.GeoDataFrame, crs=4326)
         )
         return df
 
-    def parse_subplots(self, dir):
-        files = (dir).glob("*.xlsx")
-
-        plots = []
-        for file in files:
-            #plots.append(pd.read_excel(file))
-            plots.append(pd.read_excel(file))
+    def parse_subplots(self, dir, plots=None):
+        if plots is None:
+            plots = read_workbooks((dir).glob("*.xlsx"))
 
         df = pd.concat(plots)
         print(df.head(5))
+        # parse_polygon only reads these columns
+        subplot_columns = [
+            "plot_id", "enumerator", "enumerator_id", "starttime", "device_info",
+            *(f"gt_subplot_{i}" for i in range(1, 17)),
+        ]
         df = (
             df.reset_index()
-            .assign(plot_id=lambda x: x.apply(create_gt_plotid, axis=1))
+            .assign(plot_id=create_gt_plotids)[subplot_columns]
             .groupby("plot_id")
             .apply(self.parse_polygon)
             .reset_index(level=0)
@@ -58,13 +62,11 @@ class SurveyCTO_GroundTruthCollectionv3:
 
     def parse_tree_list(self, dir):
         files = (dir / "ground-truth").glob("*.xlsx")
-        plots = []
-        for file in files:
-            plots.append(pd.read_excel(file))
+        plots = read_workbooks(files)
         df = pd.concat(plots)
         df_trees = (
             df.reset_index()
-            .assign(plot_id=lambda x: x.apply(create_gt_plotid, axis=1))
+            .assign(plot_id=create_gt_plotids)
             .groupby("plot_id")
             .apply(self.parse_trees)
             .reset_index(level=0)
@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Optional
 
 import pandas as pd
 
@@ -8,12 +9,23 @@ from gt_config import EXCELVERSION, YEAR
 
 # from src.ground_truth.akvo_gt_check.SurveyCTO_GroundTruthCollectionv3 import \
 from SurveyCTO_GroundTruthCollectionv3 import \
-    SurveyCTO_GroundTruthCollectionv3
+    SurveyCTO_GroundTruthCollectionv3, read_workbooks
 
 
 class ExcelParser:
     @staticmethod
-    def parse_subplots(dir_output: Path) -> pd.DataFrame:
+    def read_exports(dir_output: Path) -> dict:
+        # parse_subplots and parse_plots read the same workbooks, so read each
+        # version's export once and hand the frames to both
+        directory = dir_output / "ground-truth" / YEAR
+        return {
+            f.name: read_workbooks(Path(f.path).glob("*.xlsx"))
+            for f in os.scandir(directory)
+            if f.is_dir()
+        }
+
+    @staticmethod
+    def parse_subplots(dir_output: Path, workbooks: Optional[dict] = None) -> pd.DataFrame:
         files_list = []
         directory = dir_output / "ground-truth" / YEAR
         list_subfolders_with_paths = [
@@ -29,7 +41,8 @@ class ExcelParser:
 
             files_list.append(
                 parsers[version]().parse_subplots(
-                    dir_output / "ground-truth" / YEAR / version
+                    dir_output / "ground-truth" / YEAR / version,
+                    None if workbooks is None else workbooks[version],
                 )
             )
         concat_df = pd.concat(files_list)
@@ -37,7 +50,7 @@ class ExcelParser:
         return concat_df
 
     @staticmethod
-    def parse_plots(dir_output: Path) -> pd.DataFrame:
+    def parse_plots(dir_output: Path, workbooks: Optional[dict] = None) -> pd.DataFrame:
         files_list = []
         directory = dir_output / "ground-truth" / YEAR
         list_subfolders_with_paths = [
@@ -53,7 +66,8 @@ class ExcelParser:
 
             files_list.append(
                 parsers[version]().parse_plots(
-                    dir_output / "ground-truth" / YEAR / version
+                    dir_output / "ground-truth" / YEAR / version,
+                    None if workbooks is None else workbooks[version],
                 )
             )
         concat_df = pd.concat(files_list)
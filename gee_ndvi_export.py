@@ -6,6 +6,7 @@ import geopandas as gpd
 import ee
 import geemap
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from gt_config import PARTNER
 
 # --- CONFIGURABLE ---
@@ -13,6 +14,7 @@ DEFAULT_SELECTED_PLOTS_PATH = os.path.join(os.path.dirname(__file__), '../output
 OUTPUT_XLSX_PATH = os.path.join(os.path.dirname(__file__), f'../output/selected_plots_ndvi_{PARTNER}.xlsx')
 CLOUD_PCT_THRESHOLD = 20  # Max cloud cover %
 N_IMAGES = 6  # Number of latest images to use
+MAX_WORKERS = 8  # Plots queried from Earth Engine at the same time
 
 # --- INIT EE ---
 try:
@@ -78,14 +80,30 @@ def load_selected_plots(input_path):
         gdf = gdf.to_crs('EPSG:4326')
     return gdf
 
+def ndvi_for_plot(plot_id, coords):
+    """Query the mean NDVI of one plot; the work is waiting on Earth Engine, so plots run in threads."""
+    try:
+        mean_ndvi, dates = get_mean_ndvi_for_polygon_latest(coords, N_IMAGES, CLOUD_PCT_THRESHOLD)
+    except Exception as e:
+        print(f"Error for plot {plot_id}: {e}")
+        mean_ndvi = None
+        dates = []
+    print(f"Plot {plot_id}: mean NDVI = {mean_ndvi}, dates used: {dates}")
+    return {
+        'plot_id': plot_id,
+        'mean_ndvi': mean_ndvi,
+        'image_dates': ','.join(dates)
+    }
+
 def main():
     parser = argparse.ArgumentParser(description='Compute mean NDVI for selected plots using Sentinel-2 imagery.')
     parser.add_argument('--input', type=str, default=DEFAULT_SELECTED_PLOTS_PATH, help='Path to selected plots file (GeoJSON, Shapefile, or Excel with geometry).')
     parser.add_argument('--output', type=str, default=OUTPUT_XLSX_PATH, help='Output Excel file for NDVI results.')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS, help='Number of plots to query from Earth Engine in parallel.')
     args = parser.parse_args()
 
     gdf = load_selected_plots(args.input)
-    results = []
+    plot_ids, plot_coords = [], []
     for idx, row in gdf.iterrows():
         plot_id = row['plot_id'] if 'plot_id' in row else idx
         geom = row['geometry']
@@ -98,21 +116,14 @@ def main():
         else:
             print(f"Skipping plot {plot_id}: unsupported geometry type {geom.geom_type}")
             continue
-        try:
-            mean_ndvi, dates = get_mean_ndvi_for_polygon_latest(coords, N_IMAGES, CLOUD_PCT_THRESHOLD)
-        except Exception as e:
-            print(f"Error for plot {plot_id}: {e}")
-            mean_ndvi = None
-            dates = []
-        results.append({
-            'plot_id': plot_id,
-            'mean_ndvi': mean_ndvi,
-            'image_dates': ','.join(dates)
-        })
-        print(f"Plot {plot_id}: mean NDVI = {mean_ndvi}, dates used: {dates}")
+        plot_ids.append(plot_id)
+        plot_coords.append(coords)
+    # pool.map keeps the results in the order of the input plots
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(ndvi_for_plot, plot_ids, plot_coords))
     # Save to Excel
     df = pd.DataFrame(results)
-    df.to_excel(args.output, index=False)
+    df.to_excel(args.output, index=False, engine="xlsxwriter")
     print(f"Saved NDVI results to {args.output}")
 
 if __name__ == '__main__':
@@ -4,27 +4,41 @@ from pathlib import Path
 import tempfile
 import os
 import shutil
+import importlib
+import hashlib
+import re
+import numpy as np
+import requests
 import folium
 from folium import plugins
 from streamlit_folium import folium_static
 import geopandas as gpd
-import json
+import shapely
+from shapely.errors import GEOSException, ShapelyError
+from shapely.geometry import Polygon, shape
+from shapely.geometry.base import BaseGeometry
+from shapely.wkt import loads as wkt_loads
+import orjson
 import logging
 from datetime import datetime
 from excel_parser import ExcelParser
 from gt_check_functions import (
     add_ecoregion, calculate_area, collect_reasons_subplot, collect_reasons_plot,
-    export_plots, export_subplots, fix_geometry, to_geojson, validate_country,
+    export_plots, export_subplots, fix_geometry, to_geojson_column, validate_country,
     validate_duplicate_id, validate_length_width_ratio, validate_nr_vertices,
-    validate_overlap, validate_protruding_ratio, validate_within_radius, geom_to_utm,
+    validate_overlap, validate_protruding_ratio, validate_within_radius, geoms_to_utm,
     calculate_minimum_rotated_rectangle
 )
 from gt_config import (
     COUNTRY, CROP, MAX_GT_PLOT_AREA_SIZE, MAX_SUBPLOT_AREA_SIZE,
     MIN_GT_PLOT_AREA_SIZE, MIN_SUBPLOT_AREA_SIZE, PARTNER, YEAR
 )
+import gt_config
 import plotly.express as px
 
+# Copy-on-write turns every derived frame (filters, column selections, shallow
+# copies) into a lazy copy, so the display code needs no defensive deep copies
+pd.options.mode.copy_on_write = True
 
 
 # Initialize session state
@@ -52,6 +66,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# A whole "Plot is protruding" entry in a ';'-separated reasons string
+PROTRUDING_REASON = re.compile(r"(?<![^;])\s*Plot is protruding\s*(?![^;])")
+
 
 def clean_enumerator_name(enumerator_str):
     """Clean up enumerator name by removing ID if present"""
@@ -61,6 +78,80 @@ def clean_enumerator_name(enumerator_str):
         return enumerator_str.split("(")[0].strip()
     return enumerator_str
 
+def split_reasons(reasons):
+    """Split ';'-separated validation reasons into one entry per reason, indexed by row position"""
+    reasons = reasons.fillna('').astype(str).reset_index(drop=True)
+    return reasons.str.split(';').explode().str.strip()
+
+def count_reasons(reasons):
+    """Count how often each ';'-separated validation reason occurs, most frequent first"""
+    reasons = split_reasons(reasons)
+    return reasons[reasons != ''].value_counts()
+
+def has_reason(reasons, reason):
+    """Boolean mask of the rows whose ';'-separated reasons include `reason`"""
+    matches = split_reasons(reasons) == reason
+    return matches.groupby(level=0).any().to_numpy()
+
+def count_valid(df):
+    """Return the number of valid and invalid rows, summing the 'valid' column once"""
+    n_valid = int(df['valid'].sum())
+    return n_valid, len(df) - n_valid
+
+def parse_selected_geometry(geom):
+    """Convert a selected plot geometry (WKT, GeoJSON or Shapely object) to a Shapely geometry.
+
+    Raises ValueError when the value cannot be converted.
+    """
+    if isinstance(geom, BaseGeometry):
+        # Already a Shapely object, just try to fix self-intersections
+        if not geom.is_valid:
+            fixed = geom.buffer(0)
+            if fixed.is_valid:
+                return fixed
+        return geom
+    if not isinstance(geom, str):
+        raise ValueError(f"Unknown geometry type: {type(geom)}")
+
+    geom = geom.strip()
+    if geom.startswith('{'):
+        try:
+            return shape(orjson.loads(geom))
+        except (ValueError, KeyError, TypeError, AttributeError, ShapelyError) as e:
+            raise ValueError(f"Invalid GeoJSON geometry: {e}") from e
+    try:
+        return wkt_loads(geom)
+    except GEOSException:
+        pass
+
+    # Fall back to reading the coordinate pairs of a malformed POLYGON string
+    if not (geom.startswith('POLYGON ((') and geom.endswith('))')):
+        raise ValueError("Unknown geometry format")
+    coords = []
+    for pair in geom[10:-2].split(','):
+        pair = pair.strip()
+        if pair:
+            lon, lat = map(float, pair.split())
+            coords.append((lon, lat))
+    if len(coords) < 3:
+        raise ValueError("Not enough coordinates for polygon")
+    return Polygon(coords)
+
+def validation_run_key(uploaded_file, selected_plot_file):
+    """Hash of the uploaded files and the validation settings, used to tell
+    whether results saved in the output directory belong to this input"""
+    digest = hashlib.blake2b(digest_size=16)
+    for upload in (uploaded_file, selected_plot_file):
+        digest.update(upload.getbuffer() if upload is not None else b"")
+    settings = (
+        gt_config.COUNTRY_ISO3, gt_config.PARTNER, gt_config.YEAR,
+        gt_config.MIN_SUBPLOT_AREA_SIZE, gt_config.MAX_SUBPLOT_AREA_SIZE,
+        gt_config.MIN_GT_PLOT_AREA_SIZE, gt_config.MAX_GT_PLOT_AREA_SIZE,
+        gt_config.MAX_VERTICES,
+    )
+    digest.update(repr(settings).encode())
+    return digest.hexdigest()
+
 def paginate_dataframe(df, page, per_page):
     """Return a paginated slice of the dataframe"""
     start_idx = (page - 1) * per_page
@@ -104,9 +195,16 @@ def create_map(df_subplots, df_plots, df_selected_plots, selected_plot_id=None):
     """Create an interactive map with layers for valid and invalid plots/subplots"""
     # Create a base map centered on the data
     if selected_plot_id:
+        # One comparison per table: the mask tells both whether the plot is
+        # there and which row holds it
+        plot_mask = (df_plots['plot_id'] == selected_plot_id).to_numpy()
+        if 'plot_id' in df_selected_plots:
+            selected_plot_mask = (df_selected_plots['plot_id'] == selected_plot_id).to_numpy()
+        else:
+            selected_plot_mask = np.zeros(len(df_selected_plots), dtype=bool)
         # If a plot is selected, center on that plot
-        if selected_plot_id in df_plots['plot_id'].values:
-            plot_data = df_plots[df_plots['plot_id'] == selected_plot_id]
+        if plot_mask.any():
+            plot_data = df_plots[plot_mask]
             if not plot_data.empty:
                 try:
                     # Get the geometry and calculate centroid
@@ -133,9 +231,9 @@ def create_map(df_subplots, df_plots, df_selected_plots, selected_plot_id=None):
                 center_lat = 0.0
                 center_lon = 0.0
                 zoom_start = 14
-        elif selected_plot_id in df_selected_plots['plot_id'].values:
+        elif selected_plot_mask.any():
             # If a selected plot is selected, center on that plot
-            selected_plot_data = df_selected_plots[df_selected_plots['plot_id'] == selected_plot_id]
+            selected_plot_data = df_selected_plots[selected_plot_mask]
             if not selected_plot_data.empty:
                 try:
                     # Get the geometry and calculate centroid
@@ -439,8 +537,10 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
             
             # Save the uploaded file to the correct location
             temp_file = ground_truth_dir / uploaded_file.name
+            # Stream the upload buffer to disk instead of materialising a bytes copy of it
+            uploaded_file.seek(0)
             with open(temp_file, 'wb') as f:
-                f.write(uploaded_file.getvalue())
+                shutil.copyfileobj(uploaded_file, f)
             
             # Process selected plot file if provided
             df_selected_plots = pd.DataFrame()
@@ -448,7 +548,7 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
                 
                 try:
                     # Read the selected plot Excel file
-                    df_selected_plots = pd.read_excel(selected_plot_file)
+                    df_selected_plots = pd.read_excel(selected_plot_file, engine="calamine")
                     
                     
                     # Check if geometry column exists
@@ -464,53 +564,37 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
                         
                         
                         for idx, row in df_selected_plots.iterrows():
-                            try:
-                                # Get plot ID for logging
-                                plot_id = row.get('plot_id', f'Row {idx}')
-                                
-                                # Check if geometry is valid
-                                geom = row['geometry']
-                                if geom is None or pd.isna(geom):
-                                    problematic_records.append({
-                                        'index': idx,
-                                        'id': plot_id,
-                                        'error': 'Geometry is None or NaN'
-                                    })
-                                    
-                                    continue
-                                
-                                # Try to validate the geometry
-                                if hasattr(geom, 'is_valid') and not geom.is_valid:
-                                    problematic_records.append({
-                                        'index': idx,
-                                        'id': plot_id,
-                                        'error': 'Invalid geometry'
-                                    })
-                                    
-                                    continue
-                                
-                                if hasattr(geom, 'is_empty') and geom.is_empty:
-                                    problematic_records.append({
-                                        'index': idx,
-                                        'id': plot_id,
-                                        'error': 'Empty geometry'
-                                    })
-                                    
-                                    continue
-                                
-                                # If we get here, the geometry is valid
-                                valid_records.append(row)
-                               
-                                
-                            except Exception as e:
-                                plot_id = row.get('plot_id', f'Row {idx}')
+                            # Get plot ID for logging
+                            plot_id = row.get('plot_id', f'Row {idx}')
+                            
+                            # Check if geometry is valid
+                            geom = row['geometry']
+                            if geom is None or (not isinstance(geom, BaseGeometry) and pd.isna(geom)):
                                 problematic_records.append({
                                     'index': idx,
                                     'id': plot_id,
-                                    'error': f'Processing error: {str(e)}'
+                                    'error': 'Geometry is None or NaN'
                                 })
-                                
                                 continue
+                            
+                            if isinstance(geom, BaseGeometry) and not geom.is_valid:
+                                problematic_records.append({
+                                    'index': idx,
+                                    'id': plot_id,
+                                    'error': 'Invalid geometry'
+                                })
+                                continue
+                            
+                            if isinstance(geom, BaseGeometry) and geom.is_empty:
+                                problematic_records.append({
+                                    'index': idx,
+                                    'id': plot_id,
+                                    'error': 'Empty geometry'
+                                })
+                                continue
+                            
+                            # If we get here, the geometry is valid
+                            valid_records.append(row)
                         
                         
                         
@@ -525,65 +609,19 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
                         if valid_records:
                             try:
                                 # Convert string geometry representations to actual Shapely objects
+                                converted_records = []
                                 for record in valid_records:
                                     try:
-                                        geom = record['geometry']
-                                        if isinstance(geom, str):
-                                            # Try different geometry formats
-                                            try:
-                                                # First try WKT (Well-Known Text) format
-                                                from shapely.wkt import loads as wkt_loads
-                                                record['geometry'] = wkt_loads(geom)
-                                            except:
-                                                try:
-                                                    # Try GeoJSON format
-                                                    import json
-                                                    from shapely.geometry import shape
-                                                    geojson_data = json.loads(geom)
-                                                    record['geometry'] = shape(geojson_data)
-                                                except:
-                                                    # Try to parse as coordinate string
-                                                    try:
-                                                        from shapely.geometry import Polygon
-                                                        # Remove POLYGON wrapper and parse coordinates
-                                                        if geom.startswith('POLYGON ((') and geom.endswith('))'):
-                                                            coord_str = geom[10:-2]  # Remove 'POLYGON ((' and '))'
-                                                            # Parse coordinate pairs
-                                                            coords = []
-                                                            for pair in coord_str.split(','):
-                                                                pair = pair.strip()
-                                                                if pair:
-                                                                    lon, lat = map(float, pair.split())
-                                                                    coords.append((lon, lat))
-                                                            if len(coords) >= 3:
-                                                                record['geometry'] = Polygon(coords)
-                                                                logger.debug(f"Converted coordinate string to Shapely Polygon")
-                                                            else:
-                                                                raise ValueError("Not enough coordinates for polygon")
-                                                        else:
-                                                            raise ValueError("Unknown geometry format")
-                                                    except Exception as coord_error:
-                                                        logger.warning(f"Could not parse geometry string: {str(coord_error)}")
-                                                        raise coord_error
-                                        elif hasattr(geom, 'wkt'):
-                                            # Already a Shapely object, just ensure it's valid
-                                            if not geom.is_valid:
-                                                geom = geom.buffer(0)  # Try to fix self-intersections
-                                                if geom.is_valid:
-                                                    record['geometry'] = geom
-                                                
-                                        else:
-                                            raise ValueError(f"Unknown geometry type: {type(geom)}")
-                                            
-                                    except Exception as e:
-                                        # Remove this record from valid_records
-                                        valid_records.remove(record)
+                                        record['geometry'] = parse_selected_geometry(record['geometry'])
+                                    except ValueError as e:
                                         problematic_records.append({
                                             'index': len(problematic_records),
                                             'id': record.get('plot_id', 'Unknown'),
                                             'error': f'Geometry conversion error: {str(e)}'
                                         })
                                         continue
+                                    converted_records.append(record)
+                                valid_records = converted_records
                                 
                                 
                                 if valid_records:
@@ -594,9 +632,9 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
                                     logger.info("Calculating areas for selected plots using UTM projection...")
                                     
                                     # Calculate areas using UTM projection (same method as main plots/subplots)
-                                    df_selected_plots['area_ha'] = df_selected_plots[~df_selected_plots.geometry.isna()].geometry.apply(
-                                        lambda x: geom_to_utm(x).area / 10000  # Convert from m² to hectares
-                                    )
+                                    df_selected_plots['area_ha'] = shapely.area(
+                                        geoms_to_utm(df_selected_plots.geometry.to_numpy())
+                                    ) / 10000  # Convert from m² to hectares
                                     
                                     logger.info(f"Area calculation complete. Range: {df_selected_plots['area_ha'].min():.2f} - {df_selected_plots['area_ha'].max():.2f} hectares")
                                     
@@ -643,9 +681,12 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
             
             # Process subplots
             logger.info("Processing subplots...")
+            workbooks = None
             try:
                 logger.info("Starting subplot parsing...")
-                df_subplots = ExcelParser.parse_subplots(temp_dir)
+                # read the uploaded workbooks once for both the subplot and plot parsing
+                workbooks = ExcelParser.read_exports(temp_dir)
+                df_subplots = ExcelParser.parse_subplots(temp_dir, workbooks)
                 logger.info(f"Parsed {len(df_subplots)} subplots from Excel files")
                 
                 logger.info("Applying geometry fixes...")
@@ -703,14 +744,13 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
                 
                 logger.info("Collecting validation reasons...")
                 df_subplots = df_subplots.assign(
-                    reasons=lambda x: x.apply(collect_reasons_subplot, axis=1),
+                    reasons=collect_reasons_subplot,
                     valid=lambda x: x.reasons.apply(len) == 0,
-                    geojson=lambda x: x.apply(
-                        lambda x: to_geojson(x.geometry, x.subplot_id), axis=1
-                    ),
+                    geojson=lambda x: to_geojson_column(x, "subplot_id"),
                 )
                 logger.info(f"Successfully processed {len(df_subplots)} subplots")
-                logger.info(f"Valid subplots: {df_subplots['valid'].sum()}, Invalid subplots: {(~df_subplots['valid']).sum()}")
+                n_valid_subplots, n_invalid_subplots = count_valid(df_subplots)
+                logger.info(f"Valid subplots: {n_valid_subplots}, Invalid subplots: {n_invalid_subplots}")
             except Exception as e:
                 logger.error(f"Error processing subplots: {str(e)}", exc_info=True)
                 st.error(f"Error processing subplots: {str(e)}")
@@ -720,7 +760,7 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
             logger.info("Processing plots...")
             try:
                 logger.info("Starting plot parsing...")
-                df_plots = ExcelParser.parse_plots(temp_dir)
+                df_plots = ExcelParser.parse_plots(temp_dir, workbooks)
                 logger.info(f"Parsed {len(df_plots)} plots from Excel files")
                 
                 logger.info("Applying geometry fixes...")
@@ -774,12 +814,13 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
                 
                 logger.info("Collecting validation reasons...")
                 df_plots = df_plots.assign(
-                    reasons=lambda x: x.apply(collect_reasons_plot, axis=1),
+                    reasons=collect_reasons_plot,
                     valid=lambda x: x.reasons.apply(len) == 0,
-                    geojson=lambda x: x.apply(lambda x: to_geojson(x.geometry, x.plot_id), axis=1),
+                    geojson=lambda x: to_geojson_column(x, "plot_id"),
                 )
                 logger.info(f"Successfully processed {len(df_plots)} plots")
-                logger.info(f"Valid plots: {df_plots['valid'].sum()}, Invalid plots: {(~df_plots['valid']).sum()}")
+                n_valid_plots, n_invalid_plots = count_valid(df_plots)
+                logger.info(f"Valid plots: {n_valid_plots}, Invalid plots: {n_invalid_plots}")
             except Exception as e:
                 logger.error(f"Error processing plots: {str(e)}", exc_info=True)
                 st.error(f"Error processing plots: {str(e)}")
@@ -798,9 +839,9 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
             logger.info(f"Plots processed: {len(df_plots)}")
             
             if not df_subplots.empty:
-                logger.info(f"Subplot validation: {df_subplots['valid'].sum()} valid, {(~df_subplots['valid']).sum()} invalid")
+                logger.info(f"Subplot validation: {n_valid_subplots} valid, {n_invalid_subplots} invalid")
             if not df_plots.empty:
-                logger.info(f"Plot validation: {df_plots['valid'].sum()} valid, {(~df_plots['valid']).sum()} invalid")
+                logger.info(f"Plot validation: {n_valid_plots} valid, {n_invalid_plots} invalid")
             
             # Display summary to user
             st.success("✅ Data processing completed!")
@@ -813,14 +854,14 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
             with col2:
                 st.metric("Subplots", len(df_subplots))
                 if not df_subplots.empty:
-                    st.metric("Valid Subplots", df_subplots['valid'].sum())
-                    st.metric("Invalid Subplots", (~df_subplots['valid']).sum())
+                    st.metric("Valid Subplots", n_valid_subplots)
+                    st.metric("Invalid Subplots", n_invalid_subplots)
             
             with col3:
                 st.metric("Plots", len(df_plots))
                 if not df_plots.empty:
-                    st.metric("Valid Plots", df_plots['valid'].sum())
-                    st.metric("Invalid Plots", (~df_plots['valid']).sum())
+                    st.metric("Valid Plots", n_valid_plots)
+                    st.metric("Invalid Plots", n_invalid_plots)
             
             # Export results
             output_dir = Path(output_dir)
@@ -847,15 +888,14 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
                     # Export selected plots to GeoJSON
                     logger.info("Exporting selected plots to GeoJSON...")
                     
-                    # Create a copy for export (remove any problematic columns)
-                    df_selected_plots_export = df_selected_plots.copy()
+                    # Export only the essential columns (remove any problematic columns)
+                    df_selected_plots_export = df_selected_plots
                     
                     # Ensure we have the essential columns
-                    export_columns = ['plot_id', 'area_ha', 'geometry']
-                    if 'enumerator' in df_selected_plots_export.columns:
-                        export_columns.append('enumerator')
-                    if 'collection_date' in df_selected_plots_export.columns:
-                        export_columns.append('collection_date')
+                    export_columns = ['plot_id', 'area_ha', 'geometry'] + [
+                        col for col in ('enumerator', 'collection_date')
+                        if col in df_selected_plots_export.columns
+                    ]
                     
                     # Select only the columns we want to export
                     df_selected_plots_export = df_selected_plots_export[export_columns]
@@ -871,7 +911,7 @@ def process_data(uploaded_file, selected_plot_file, output_dir):
                     
                     # Also export as Excel for reference
                     selected_plots_excel_path = output_dir / "selected_plots.xlsx"
-                    df_selected_plots_export.to_excel(selected_plots_excel_path, index=False)
+                    df_selected_plots_export.to_excel(selected_plots_excel_path, index=False, engine="xlsxwriter")
                     logger.info(f"Successfully exported {len(df_selected_plots)} selected plots to {selected_plots_excel_path}")
                     
             except Exception as e:
@@ -951,11 +991,7 @@ if uploaded_file is not None and st.button("Validate Data"):
     # Use the selected country ISO3 from the dropdown
     selected_iso3 = st.session_state.get("COUNTRY_ISO3")
     # Patch the COUNTRY_ISO3 in gt_config for this session (monkey patch)
-    import sys
-    import importlib
-    if "gt_config" in sys.modules:
-        importlib.reload(sys.modules["gt_config"])
-    import gt_config
+    importlib.reload(gt_config)
     gt_config.COUNTRY_ISO3 = selected_iso3
     # Define expected output files
     plots_valid_fp = output_path / "plots_valid.geojson"
@@ -963,22 +999,34 @@ if uploaded_file is not None and st.button("Validate Data"):
     subplots_valid_fp = output_path / "subplots_valid.geojson"
     subplots_invalid_fp = output_path / "subplots_invalid.geojson"
     selected_plots_fp = output_path / "selected_plots.geojson"
-    # Check if all required files exist
-    files_exist = all(f.exists() for f in [plots_valid_fp, plots_invalid_fp, subplots_valid_fp, subplots_invalid_fp])
+    run_key_fp = output_path / "validation_key.txt"
+    run_key = validation_run_key(uploaded_file, selected_plot_file)
+    result_files = [plots_valid_fp, plots_invalid_fp, subplots_valid_fp, subplots_invalid_fp]
+    # Reuse saved results only if they were produced from the same upload and settings
+    files_exist = (
+        all(f.exists() for f in result_files)
+        and run_key_fp.exists()
+        and run_key_fp.read_text() == run_key
+    )
     selected_plots_exist = selected_plots_fp.exists()
     try:
         if files_exist:
             with st.spinner("Loading existing validation results..."):
-                df_plots_valid = gpd.read_file(plots_valid_fp)
-                df_plots_invalid = gpd.read_file(plots_invalid_fp)
-                df_subplots_valid = gpd.read_file(subplots_valid_fp)
-                df_subplots_invalid = gpd.read_file(subplots_invalid_fp)
+                df_plots_valid = gpd.read_file(plots_valid_fp, engine="pyogrio", use_arrow=True)
+                df_plots_invalid = gpd.read_file(plots_invalid_fp, engine="pyogrio", use_arrow=True)
+                df_subplots_valid = gpd.read_file(subplots_valid_fp, engine="pyogrio", use_arrow=True)
+                df_subplots_invalid = gpd.read_file(subplots_invalid_fp, engine="pyogrio", use_arrow=True)
                 # Combine valid/invalid for full DataFrame
                 df_plots = pd.concat([df_plots_valid.assign(valid=True), df_plots_invalid.assign(valid=False)], ignore_index=True)
                 df_subplots = pd.concat([df_subplots_valid.assign(valid=True), df_subplots_invalid.assign(valid=False)], ignore_index=True)
+                # The GeoJSON driver may return collection_date as datetimes; normalise it
+                # once here so the tables below can display it as-is on every rerun
+                for df in (df_plots, df_subplots):
+                    if 'collection_date' in df.columns:
+                        df['collection_date'] = pd.to_datetime(df['collection_date']).dt.strftime('%Y-%m-%d')
                 # Load selected plots if available
                 if selected_plots_exist:
-                    df_selected_plots = gpd.read_file(selected_plots_fp)
+                    df_selected_plots = gpd.read_file(selected_plots_fp, engine="pyogrio", use_arrow=True)
                     # Merge NDVI and slope if missing
                     if not df_selected_plots.empty and ('mean_ndvi' not in df_selected_plots.columns or 'mean_slope' not in df_selected_plots.columns):
                         try:
@@ -1002,7 +1050,13 @@ if uploaded_file is not None and st.button("Validate Data"):
                 st.success(f"Loaded existing validation results from {output_dir}")
         else:
             with st.spinner("Processing data..."):
+                # The exporters skip empty valid/invalid splits, so clear the previous
+                # results first; otherwise a stale file would pass the exists() check below
+                for f in [run_key_fp, selected_plots_fp, *result_files]:
+                    f.unlink(missing_ok=True)
                 df_subplots, df_plots, df_selected_plots = process_data(uploaded_file, selected_plot_file, output_dir)
+                if all(f.exists() for f in result_files):
+                    run_key_fp.write_text(run_key)
                 st.session_state.processed_data = {
                     'df_subplots': df_subplots,
                     'df_plots': df_plots,
@@ -1040,26 +1094,20 @@ if st.session_state.processed_data is not None:
         # st.subheader("Interactive Map")
         
         # --- Plot Validation Reason Filter ---
-        plot_reason_counts = {}
-        for reasons in df_plots['reasons'].dropna():
-            for reason in str(reasons).split(';'):
-                reason = reason.strip()
-                if reason:
-                    plot_reason_counts[reason] = plot_reason_counts.get(reason, 0) + 1
-        all_plot_reasons = sorted(plot_reason_counts.keys(), key=lambda k: plot_reason_counts[k], reverse=True)
-        plot_reason_options = [f"{reason} ({plot_reason_counts[reason]})" for reason in all_plot_reasons]
+        plot_reason_counts = count_reasons(df_plots['reasons'])
+        plot_reason_options = [f"{reason} ({count})" for reason, count in plot_reason_counts.items()]
         selected_plot_reason = st.selectbox(
             "Filter plots by validation reason",
             ["All"] + plot_reason_options,
             key="map_plot_reason_filter"
         )
         # Filter plots accordingly
-        filtered_df_plots = df_plots.copy()
         if selected_plot_reason != "All":
             selected_reason = selected_plot_reason.split(" (")[0]
-            filtered_df_plots = filtered_df_plots[filtered_df_plots['reasons'].fillna('').apply(lambda x: any(selected_reason == reason.strip() for reason in str(x).split(';')))]
+            # Boolean indexing already returns a new frame, no need to copy first
+            filtered_df_plots = df_plots[has_reason(df_plots['reasons'], selected_reason)]
         else:
-            filtered_df_plots = df_plots.copy()
+            filtered_df_plots = df_plots.copy(deep=False)
         
         # Create simple border styling
         st.markdown("""
@@ -1083,19 +1131,18 @@ if st.session_state.processed_data is not None:
             # Prepare plots data
             # Ensure mrr_ratio and minimum_rotated_rectangle_m2 columns exist
             if 'mrr_ratio' not in filtered_df_plots.columns or 'minimum_rotated_rectangle_m2' not in filtered_df_plots.columns:
-                from gt_check_functions import calculate_minimum_rotated_rectangle, calculate_area
-                temp_df = filtered_df_plots.copy()
+                temp_df = filtered_df_plots.copy(deep=False)
                 temp_df = calculate_area(temp_df)
                 temp_df = calculate_minimum_rotated_rectangle(temp_df)
                 temp_df['mrr_ratio'] = temp_df['minimum_rotated_rectangle_m2'] / temp_df['area_m2']
                 filtered_df_plots['mrr_ratio'] = temp_df['mrr_ratio']
                 filtered_df_plots['minimum_rotated_rectangle_m2'] = temp_df['minimum_rotated_rectangle_m2']
-            plots_data = filtered_df_plots[['plot_id', 'enumerator_display', 'collection_date', 'valid', 'reasons', 'area_m2', 'minimum_rotated_rectangle_m2', 'mrr_ratio']].copy()
+            plots_data = filtered_df_plots[['plot_id', 'enumerator_display', 'collection_date', 'valid', 'reasons', 'area_m2', 'minimum_rotated_rectangle_m2', 'mrr_ratio']]
             plots_data['valid'] = plots_data['valid'].map({True: 'Valid', False: 'Invalid'})
             
             # Create selectbox for plot selection using all plots instead of paginated ones
-            plot_options = [f"{row['plot_id']} - {row['enumerator_display']} ({row['valid']})" 
-                          for _, row in plots_data.iterrows()]
+            plot_options = [f"{plot_id} - {enumerator} ({valid})"
+                          for plot_id, enumerator, valid in zip(plots_data['plot_id'], plots_data['enumerator_display'], plots_data['valid'])]
             
             # Find the index of the currently selected plot
             current_plot_index = 0
@@ -1215,6 +1262,7 @@ if st.session_state.processed_data is not None:
                     plot_subplots = df_subplots[df_subplots['plot_id'] == st.session_state.selected_plot_id]
                     
                     if not plot_subplots.empty:
+                        plot_valid_subplots, plot_invalid_subplots = count_valid(plot_subplots)
                         # Display subplot summary in a compact box
                         subplot_summary_html = f"""
                         <div class="plot-details-box">
@@ -1225,11 +1273,11 @@ if st.session_state.processed_data is not None:
                                 </div>
                                 <div class="plot-detail-item">
                                     <div class="plot-detail-label">Valid Subplots</div>
-                                    <div class="plot-detail-value">✅ {plot_subplots['valid'].sum()}</div>
+                                    <div class="plot-detail-value">✅ {plot_valid_subplots}</div>
                                 </div>
                                 <div class="plot-detail-item">
                                     <div class="plot-detail-label">Invalid Subplots</div>
-                                    <div class="plot-detail-value">❌ {(~plot_subplots['valid']).sum()}</div>
+                                    <div class="plot-detail-value">❌ {plot_invalid_subplots}</div>
                                 </div>
                             </div>
                         </div>
@@ -1237,7 +1285,7 @@ if st.session_state.processed_data is not None:
                         st.markdown(subplot_summary_html, unsafe_allow_html=True)
                         
                         # Prepare subplots data
-                        subplots_data = plot_subplots[['subplot_id', 'enumerator_display', 'collection_date', 'valid', 'reasons']].copy()
+                        subplots_data = plot_subplots[['subplot_id', 'enumerator_display', 'collection_date', 'valid', 'reasons']]
                         subplots_data['valid'] = subplots_data['valid'].map({True: 'Valid', False: 'Invalid'})
                         
                         # Sort by validation status (Invalid first, then Valid)
@@ -1299,14 +1347,13 @@ if st.session_state.processed_data is not None:
             ignore_empty_geom = st.checkbox("Ignore empty geometries", value=False, key="ignore_empty_geometries_switch")
             # Filter sub-plots if switch is on
             if ignore_empty_geom:
-                df_subplots_filtered = df_subplots[~df_subplots['reasons'].fillna('').str.contains('Empty geometry')].copy()
+                df_subplots_filtered = df_subplots[~df_subplots['reasons'].fillna('').str.contains('Empty geometry')]
             else:
-                df_subplots_filtered = df_subplots.copy()
+                df_subplots_filtered = df_subplots
             st.write("### Subplots Summary")
             if df_subplots_filtered is not None and not df_subplots_filtered.empty:
                 total_subplots = len(df_subplots_filtered)
-                valid_subplots = df_subplots_filtered['valid'].sum()
-                invalid_subplots = (~df_subplots_filtered['valid']).sum()
+                valid_subplots, invalid_subplots = count_valid(df_subplots_filtered)
                 valid_pct = (valid_subplots / total_subplots * 100) if total_subplots else 0
                 invalid_pct = (invalid_subplots / total_subplots * 100) if total_subplots else 0
                 st.write(f"Total subplots: {total_subplots}")
@@ -1314,24 +1361,17 @@ if st.session_state.processed_data is not None:
                 st.write(f"Invalid subplots: {invalid_subplots} ({invalid_pct:.1f}%)")
 
                 # --- Horizontal bar chart for sub-plot validation fail reasons ---
-                subplot_reason_counts = {}
-                for reasons in df_subplots_filtered['reasons'].dropna():
-                    for reason in str(reasons).split(';'):
-                        r = reason.strip()
-                        if r:
-                            subplot_reason_counts[r] = subplot_reason_counts.get(r, 0) + 1
-                if subplot_reason_counts:
-                    subplot_reason_df = pd.DataFrame({
-                        'Reason': list(subplot_reason_counts.keys()),
-                        'Count': list(subplot_reason_counts.values())
-                    }).sort_values('Count', ascending=True)
+                subplot_reason_counts = count_reasons(df_subplots_filtered['reasons'])
+                if not subplot_reason_counts.empty:
+                    # value_counts is already sorted, most frequent first; reverse it so
+                    # the largest bar ends up at the top of the horizontal chart
+                    subplot_reason_counts = subplot_reason_counts.iloc[::-1]
                     fig = px.bar(
-                        subplot_reason_df,
-                        x='Count',
-                        y='Reason',
+                        x=subplot_reason_counts.to_numpy(),
+                        y=subplot_reason_counts.index,
                         orientation='h',
                         title='Sub-plot Validation Fail Reasons',
-                        labels={'Count': 'Count', 'Reason': 'Validation Reason'},
+                        labels={'x': 'Count', 'y': 'Validation Reason'},
                         height=300
                     )
                     st.plotly_chart(fig, use_container_width=True)
@@ -1341,8 +1381,7 @@ if st.session_state.processed_data is not None:
         with col2:
             st.write("### Plots Summary")
             total_plots = len(df_plots)
-            valid_plots = df_plots['valid'].sum()
-            invalid_plots = (~df_plots['valid']).sum()
+            valid_plots, invalid_plots = count_valid(df_plots)
             valid_plots_pct = (valid_plots / total_plots * 100) if total_plots else 0
             invalid_plots_pct = (invalid_plots / total_plots * 100) if total_plots else 0
             st.write(f"Total plots: {total_plots}")
@@ -1350,24 +1389,17 @@ if st.session_state.processed_data is not None:
             st.write(f"Invalid plots: {invalid_plots} ({invalid_plots_pct:.1f}%)")
 
             # --- Horizontal bar chart for plot validation fail reasons ---
-            plot_reason_counts = {}
-            for reasons in df_plots['reasons'].dropna():
-                for reason in str(reasons).split(';'):
-                    r = reason.strip()
-                    if r:
-                        plot_reason_counts[r] = plot_reason_counts.get(r, 0) + 1
-            if plot_reason_counts:
-                plot_reason_df = pd.DataFrame({
-                    'Reason': list(plot_reason_counts.keys()),
-                    'Count': list(plot_reason_counts.values())
-                }).sort_values('Count', ascending=True)
+            plot_reason_counts = count_reasons(df_plots['reasons'])
+            if not plot_reason_counts.empty:
+                # value_counts is already sorted, most frequent first; reverse it so
+                # the largest bar ends up at the top of the horizontal chart
+                plot_reason_counts = plot_reason_counts.iloc[::-1]
                 fig = px.bar(
-                    plot_reason_df,
-                    x='Count',
-                    y='Reason',
+                    x=plot_reason_counts.to_numpy(),
+                    y=plot_reason_counts.index,
                     orientation='h',
                     title='Plot Validation Fail Reasons',
-                    labels={'Count': 'Count', 'Reason': 'Validation Reason'},
+                    labels={'x': 'Count', 'y': 'Validation Reason'},
                     height=300
                 )
                 st.plotly_chart(fig, use_container_width=True)
@@ -1469,14 +1501,8 @@ if st.session_state.processed_data is not None:
             )
         # Validation issues filter
         # Collect all unique issues (split by ';')
-        plot_issue_counts = {}
-        for issues in df_plots['reasons'].dropna():
-            for issue in str(issues).split(';'):
-                issue = issue.strip()
-                if issue:
-                    plot_issue_counts[issue] = plot_issue_counts.get(issue, 0) + 1
-        all_plot_issues = sorted(plot_issue_counts.keys(), key=lambda k: plot_issue_counts[k], reverse=True)
-        plot_issue_options = [f"{issue} ({plot_issue_counts[issue]})" for issue in all_plot_issues]
+        plot_issue_counts = count_reasons(df_plots['reasons'])
+        plot_issue_options = [f"{issue} ({count})" for issue, count in plot_issue_counts.items()]
         with filter_col3:
             plot_issue_filter = st.selectbox(
                 "Filter by Validation Issue",
@@ -1485,23 +1511,23 @@ if st.session_state.processed_data is not None:
             )
         
         # Filter the plots data
-        filtered_plots_table = df_plots.copy()
+        filtered_plots_table = df_plots.copy(deep=False)
         if status_filter != "All":
             filtered_plots_table = filtered_plots_table[filtered_plots_table['valid'] == (status_filter == "Valid")]
         if enumerator_filter != "All":
             filtered_plots_table = filtered_plots_table[filtered_plots_table['enumerator_display'] == enumerator_filter]
         if plot_issue_filter != "All":
             selected_issue = plot_issue_filter.split(" (")[0]  # Extract issue name from "Issue (count)" format
-            filtered_plots_table = filtered_plots_table[filtered_plots_table['reasons'].fillna('').apply(lambda x: any(selected_issue == issue.strip() for issue in str(x).split(';')))]
+            filtered_plots_table = filtered_plots_table[has_reason(filtered_plots_table['reasons'], selected_issue)]
         
         # Prepare the table data
         # Count sub-plots for each plot
-        subplot_counts = df_subplots_filtered.groupby('plot_id').size().reset_index(name='subplot_count')
-        valid_subplot_counts = df_subplots_filtered[df_subplots_filtered['valid']].groupby('plot_id').size().reset_index(name='valid_subplot_count')
+        subplot_counts = df_subplots_filtered.groupby('plot_id')['valid'].agg(
+            subplot_count='size', valid_subplot_count='sum'
+        )
         # Add mrr_ratio if not present
         if 'mrr_ratio' not in filtered_plots_table.columns or 'minimum_rotated_rectangle_m2' not in filtered_plots_table.columns:
-            from gt_check_functions import calculate_minimum_rotated_rectangle, calculate_area
-            temp_df = filtered_plots_table.copy()
+            temp_df = filtered_plots_table.copy(deep=False)
             temp_df = calculate_area(temp_df)
             temp_df = calculate_minimum_rotated_rectangle(temp_df)
             temp_df['mrr_ratio'] = temp_df['minimum_rotated_rectangle_m2'] / temp_df['area_m2']
@@ -1515,33 +1541,23 @@ if st.session_state.processed_data is not None:
             'reasons',
             'area_m2',
             'mrr_ratio'  # keep for formatting, do not display
-        ]].copy()
-        # Merge subplot counts
-        table_data = table_data.merge(subplot_counts, on='plot_id', how='left')
-        table_data = table_data.merge(valid_subplot_counts, on='plot_id', how='left')
-        table_data['subplot_count'] = table_data['subplot_count'].fillna(0).astype(int)
-        table_data['valid_subplot_count'] = table_data['valid_subplot_count'].fillna(0).astype(int)
+        ]]
+        # Look up the subplot counts by plot id instead of merging them in
+        for count_column in ['subplot_count', 'valid_subplot_count']:
+            table_data[count_column] = table_data['plot_id'].map(subplot_counts[count_column]).fillna(0).astype(int)
         
         # Format the data for display
         table_data['valid'] = table_data['valid'].map({True: '✅ Valid', False: '❌ Invalid'})
         table_data['area_m2'] = table_data['area_m2'].round(2)
-        table_data['collection_date'] = pd.to_datetime(table_data['collection_date']).dt.strftime('%Y-%m-%d')
         # table_data['minimum_rotated_rectangle_m2'] = table_data['minimum_rotated_rectangle_m2'].round(2)
         # table_data['mrr_ratio'] = table_data['mrr_ratio'].round(3)
-        # Custom formatting for protruding reason
-        def format_reasons(row):
-            if pd.isna(row['reasons']):
-                return row['reasons']
-            reasons = str(row['reasons']).split(';')
-            formatted = []
-            for reason in reasons:
-                r = reason.strip()
-                if r == 'Plot is protruding':
-                    formatted.append(f"Plot is protruding ({row['mrr_ratio']:.3f})")
-                else:
-                    formatted.append(r)
-            return ";".join(formatted)
-        table_data['reasons'] = table_data.apply(format_reasons, axis=1)
+        # Custom formatting for protruding reason: add the ratio with one
+        # compiled substitution per row instead of splitting every string
+        table_data['reasons'] = [
+            PROTRUDING_REASON.sub(f"Plot is protruding ({mrr_ratio:.3f})", reasons)
+            if isinstance(reasons, str) else reasons
+            for reasons, mrr_ratio in zip(table_data['reasons'], table_data['mrr_ratio'])
+        ]
         
         # Display the table with custom column configuration
         st.dataframe(
@@ -1631,14 +1647,8 @@ if st.session_state.processed_data is not None:
             )
         # Validation issues filter for subplots
         # Collect all unique issues (split by ';')
-        subplot_issue_counts = {}
-        for issues in df_subplots_filtered['reasons'].dropna():
-            for issue in str(issues).split(';'):
-                issue = issue.strip()
-                if issue:
-                    subplot_issue_counts[issue] = subplot_issue_counts.get(issue, 0) + 1
-        all_subplot_issues = sorted(subplot_issue_counts.keys(), key=lambda k: subplot_issue_counts[k], reverse=True)
-        subplot_issue_options = [f"{issue} ({subplot_issue_counts[issue]})" for issue in all_subplot_issues]
+        subplot_issue_counts = count_reasons(df_subplots_filtered['reasons'])
+        subplot_issue_options = [f"{issue} ({count})" for issue, count in subplot_issue_counts.items()]
         with filter_col_issue:
             subplot_issue_filter = st.selectbox(
                 "Filter Subplots by Validation Issue",
@@ -1647,7 +1657,7 @@ if st.session_state.processed_data is not None:
             )
         
         # Filter the subplots data
-        filtered_subplots_table = df_subplots_filtered.copy()
+        filtered_subplots_table = df_subplots_filtered
         if subplot_status_filter != "All":
             filtered_subplots_table = filtered_subplots_table[filtered_subplots_table['valid'] == (subplot_status_filter == "Valid")]
         if subplot_plot_filter != "All":
@@ -1656,7 +1666,7 @@ if st.session_state.processed_data is not None:
             filtered_subplots_table = filtered_subplots_table[filtered_subplots_table['enumerator_display'] == subplot_enumerator_filter]
         if subplot_issue_filter != "All":
             selected_subplot_issue = subplot_issue_filter.split(" (")[0]  # Extract issue name from "Issue (count)" format
-            filtered_subplots_table = filtered_subplots_table[filtered_subplots_table['reasons'].fillna('').apply(lambda x: any(selected_subplot_issue == issue.strip() for issue in str(x).split(';')))]
+            filtered_subplots_table = filtered_subplots_table[has_reason(filtered_subplots_table['reasons'], selected_subplot_issue)]
         
         # Prepare the subplots table data
         subplot_table_data = filtered_subplots_table[[
@@ -1667,12 +1677,11 @@ if st.session_state.processed_data is not None:
             'valid',
             'reasons',
             'area_m2'
-        ]].copy()
+        ]]
         
         # Format the subplots data for display
         subplot_table_data['valid'] = subplot_table_data['valid'].map({True: '✅ Valid', False: '❌ Invalid'})
         subplot_table_data['area_m2'] = subplot_table_data['area_m2'].round(2)
-        subplot_table_data['collection_date'] = pd.to_datetime(subplot_table_data['collection_date']).dt.strftime('%Y-%m-%d')
         
         # Display the subplots table
         st.dataframe(
@@ -1736,10 +1745,9 @@ if st.session_state.processed_data is not None:
     if len(tabs) > 2:
         with tabs[2]:
             # st.subheader("Selected Plots Explorer")
-            import requests
             # --- Plot selection dropdown ---
             selected_plot_ids = df_selected_plots['plot_id'].astype(str).tolist()
-            plot_dropdown_options = [(pid, f"{pid} - {row['area_ha']:.2f} ha") for pid, row in df_selected_plots.set_index('plot_id').iterrows()]
+            plot_dropdown_options = [(pid, f"{pid} - {area_ha:.2f} ha") for pid, area_ha in zip(df_selected_plots['plot_id'], df_selected_plots['area_ha'])]
             # Default selection logic
             if 'selected_explorer_plot_id' not in st.session_state:
                 st.session_state.selected_explorer_plot_id = None
@@ -1747,9 +1755,9 @@ if st.session_state.processed_data is not None:
             selectbox_labels = ["None"] + [label for _, label in plot_dropdown_options]
             selectbox_values = [None] + [pid for pid, _ in plot_dropdown_options]
             # Find the index of the current selection
-            if st.session_state.selected_explorer_plot_id in selectbox_values:
+            try:
                 current_index = selectbox_values.index(st.session_state.selected_explorer_plot_id)
-            else:
+            except ValueError:
                 current_index = 0
             selected_index = st.selectbox(
                 "Select a plot to zoom and highlight",
@@ -1792,7 +1800,7 @@ if st.session_state.processed_data is not None:
                 address_latlon = (float(address_selected['lat']), float(address_selected['lon']))
                 st.success(f"Address selected: {address_selected['display_name']} ({address_latlon[0]:.5f}, {address_latlon[1]:.5f})")
             # Compute distances if address is available
-            df_selected_plots_display = df_selected_plots.copy()
+            df_selected_plots_display = df_selected_plots.copy(deep=False)
             if address_latlon is not None:
                 from geopy.distance import geodesic
                 # Compute centroid for each plot geometry
@@ -1804,8 +1812,6 @@ if st.session_state.processed_data is not None:
                 try:
                     import osmnx as ox
                     import networkx as nx
-                    import pickle
-                    import hashlib
                     # Determine bounding box for the network (buffer around address and plots)
                     buffer_m = 10000  # 10km
                     # Get all plot centroids
@@ -1845,11 +1851,11 @@ if st.session_state.processed_data is not None:
                 except Exception as e:
                     st.error(f"Error calculating road distances: {str(e)}")
             # Table display
-            table_cols = ['plot_id', 'area_ha']
             # Only include NDVI, slope, and distance columns if present
-            for col in ['mean_ndvi', 'mean_slope', 'distance_km', 'road_distance_km']:
-                if col in df_selected_plots_display.columns and col not in table_cols:
-                    table_cols.append(col)
+            table_cols = ['plot_id', 'area_ha'] + [
+                col for col in ('mean_ndvi', 'mean_slope', 'distance_km', 'road_distance_km')
+                if col in df_selected_plots_display.columns
+            ]
             st.dataframe(
                 df_selected_plots_display[table_cols].sort_values('road_distance_km' if 'road_distance_km' in table_cols else 'distance_km' if 'distance_km' in table_cols else 'plot_id'),
                 column_config={
@@ -1866,8 +1872,6 @@ if st.session_state.processed_data is not None:
             )
             # Map display
             st.write("### Map of Sampled Plots")
-            import folium
-            from streamlit_folium import folium_static
             # Add radio button for NDVI/Slope layer selection
             layer_choice = None
             if 'mean_ndvi' in df_selected_plots_display.columns and 'mean_slope' in df_selected_plots_display.columns:
@@ -1956,7 +1960,6 @@ if st.session_state.processed_data is not None:
                     )
                 ).add_to(m)
             # Add only the selected layer (NDVI or Slope)
-            import numpy as np
             legend_html = '''
              <div style="
              position: absolute; 
@@ -2075,8 +2078,8 @@ if st.session_state.processed_data is not None:
 # --- Country ISO3 Dropdown (at the top of the app) ---
 country_json_path = "country_dropdown_options.json"
 if os.path.exists(country_json_path):
-    with open(country_json_path, "r", encoding="utf-8") as f:
-        country_options = json.load(f)
+    with open(country_json_path, "rb") as f:
+        country_options = orjson.loads(f.read())
     country_options = sorted(country_options, key=lambda x: x["name"])
     name_to_iso3 = {item["name"]: item["iso3"] for item in country_options}
     country_names = [item["name"] for item in country_options]
@@ -6,7 +6,7 @@ from excel_parser import ExcelParser
 #from src.ground_truth.akvo_gt_check.gt_check_functions import (
 from gt_check_functions import (
     add_ecoregion, calculate_area, collect_reasons_subplot, collect_reasons_plot, export_plots,
-    export_subplots, fix_geometry, to_geojson, validate_country,
+    export_subplots, fix_geometry, to_geojson_column, validate_country,
     validate_duplicate_id, validate_length_width_ratio, validate_nr_vertices,
     validate_overlap, validate_protruding_ratio, validate_within_radius)
 # from src.ground_truth.akvo_gt_check.gt_config import (COUNTRY, CROP,
@@ -33,10 +33,13 @@ def overlap_filter(x):
     ]
 
 
+# read the workbooks once for both the subplot and plot parsing
+workbooks = ExcelParser.read_exports(dir_output)
+
 print(f"Creating subplots files for {PARTNER} {COUNTRY}\n")
 
 df_subplots = (
-    ExcelParser.parse_subplots(dir_output)
+    ExcelParser.parse_subplots(dir_output, workbooks)
     .pipe(fix_geometry)
     .pipe(add_ecoregion, "subplot_id")
     .pipe(validate_length_width_ratio, 2)
@@ -54,11 +57,9 @@ df_subplots = (
         filter=overlap_filter,
     )
     .assign(
-        reasons=lambda x: x.apply(collect_reasons_subplot, axis=1),
+        reasons=collect_reasons_subplot,
         valid=lambda x: x.reasons.apply(len) == 0,
-        geojson=lambda x: x.apply(
-            lambda x: to_geojson(x.geometry, x.subplot_id), axis=1
-        ),
+        geojson=lambda x: to_geojson_column(x, "subplot_id"),
     )
     .pipe(export_subplots, dir_output)
 )
@@ -79,7 +80,7 @@ print(f"Creating plots files for {PARTNER} {COUNTRY}\n")
 
 
 df_plots = (
-    ExcelParser.parse_plots(dir_output)
+    ExcelParser.parse_plots(dir_output, workbooks)
     .pipe(fix_geometry)
     .pipe(add_ecoregion, "plot_id")
     .pipe(validate_protruding_ratio, 1.55)
@@ -96,9 +97,9 @@ df_plots = (
         filter=overlap_filter,
     )
     .assign(
-        reasons=lambda x: x.apply(collect_reasons_plot, axis=1),
+        reasons=collect_reasons_plot,
         valid=lambda x: x.reasons.apply(len) == 0,
-        geojson=lambda x: x.apply(lambda x: to_geojson(x.geometry, x.plot_id), axis=1),
+        geojson=lambda x: to_geojson_column(x, "plot_id"),
     )
     .pipe(export_plots, dir_output)
 )
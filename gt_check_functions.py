@@ -3,24 +3,26 @@ import datetime as dt
 import json
 import math
 import os
+from collections import Counter
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, wraps
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Callable, Optional, TypeVar
 
 import geopandas as gpd
 import pandas as pd
 import shapely
-import utm
 from geojson_rewind import rewind
 from geopandas import GeoDataFrame
 from pyproj import CRS, Transformer
+from pyproj.enums import TransformDirection
 from shapely.geometry import Polygon, mapping, shape
-from shapely.geometry.polygon import Point, orient
-from shapely.ops import transform
+from shapely.geometry.polygon import orient
 import logging
 import warnings
 import numpy as np
+import orjson
 
 # from src.ground_truth.akvo_gt_check.gt_config import (COUNTRY_ISO3,
 from gt_config import (COUNTRY_ISO3,
@@ -57,7 +59,6 @@ def log_step(func: F) -> Any:
 
     return wrapper
 
-@log_step
 #def add_ecoregion(gdf: gpd.GeoDataFrame, id_column: str) -> gpd.GeoDataFrame:
  #   path = Path.cwd() / "data" / "datasets" / "wwf-ecoregions" / "wwf_terr_ecos.shp"
   #  ecoregion = (
@@ -67,17 +68,34 @@ def log_step(func: F) -> Any:
     #)
 
 
-def add_ecoregion(gdf: gpd.GeoDataFrame, id_column: str) -> gpd.GeoDataFrame:
-    path = "/Users/joy/Downloads/Rabobank_ACORN_Initiative/AcornGT/datasets/wwf-ecoregions/wwf_terr_ecos.shp"
-    ecoregion = (
-        gpd.read_file(path)
+@lru_cache(maxsize=1)
+def read_ecoregions(path: str) -> gpd.GeoDataFrame:
+    # the shapefile is large and identical for every validation run, so it is
+    # read once per process; callers share the frame and must not modify it
+    return (
+        gpd.read_file(path, engine="pyogrio", use_arrow=True)
         .to_crs("EPSG:4326")
         .rename(columns={"ECO_NAME": "ecoregion"})[["geometry", "ecoregion"]]
     )
 
+
+@log_step
+def add_ecoregion(gdf: gpd.GeoDataFrame, id_column: str) -> gpd.GeoDataFrame:
+    path = "/Users/joy/Downloads/Rabobank_ACORN_Initiative/AcornGT/datasets/wwf-ecoregions/wwf_terr_ecos.shp"
+    ecoregion = read_ecoregions(path)
+
+    gdf_buffered = gdf.assign(geometry=lambda x: x.buffer(0))
+    # query all plots against one STRtree of the ecoregions, so the overlay
+    # (which validates and intersects every polygon it gets) only sees the
+    # handful of ecoregions the plots actually touch
+    _, ecoregion_idx = shapely.STRtree(ecoregion.geometry.to_numpy()).query(
+        gdf_buffered.geometry.to_numpy(), predicate="intersects"
+    )
+    ecoregion = ecoregion.iloc[np.unique(ecoregion_idx)]
+
     # you can overlap with multiple ecoregions, but we choose the biggest overlap
     overlap = (
-        gdf.assign(geometry=lambda x: x.buffer(0))
+        gdf_buffered
         .overlay(ecoregion, keep_geom_type=False)
         .pipe(calculate_area)
         .sort_values(by="area_m2")
@@ -89,38 +107,90 @@ def calculate_area(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     if gdf.crs.to_epsg() != 4326:
         gdf = gdf.to_crs("EPSG:4326")
     # gdf["area_m2"] = gdf.geometry.apply(lambda x: geom_to_utm(x).area)
-    gdf["area_m2"] = gdf[~gdf.geometry.isna()].geometry.apply(
-        lambda x: geom_to_utm(x).area
-    )
+    gdf["area_m2"] = shapely.area(geoms_to_utm(gdf.geometry.to_numpy()))
     return gdf
 
+def geoms_to_utm(geoms: np.ndarray) -> np.ndarray:
+    # project the whole array with one transformer call per UTM zone instead
+    # of one per geometry; missing geometries are kept as they are, so the
+    # result can go straight into the shapely ufuncs (which map None to NaN)
+    utm_geoms = np.array(geoms, dtype=object)
+    out_of_bounds, zone_groups = utm_zone_groups(utm_geoms)
+    utm_geoms[out_of_bounds] = Polygon()
+    for index, project in zone_groups:
+        utm_geoms[index] = transform_coordinates(utm_geoms[index], project)
+    return utm_geoms
+
+def utm_zone_groups(geoms: np.ndarray) -> tuple:
+    # positions of the geometries whose centroid is outside the UTM range,
+    # and (positions, transformer) for every UTM zone the others fall in
+    present = np.flatnonzero(~shapely.is_missing(geoms) & ~shapely.is_empty(geoms))
+    lon, lat = shapely.get_coordinates(shapely.centroid(geoms[present])).T
+    in_bounds = (-80.0 <= lat) & (lat <= 84.0) & (-180.0 <= lon) & (lon <= 180.0)
+    out_of_bounds = present[~in_bounds]
+    present, lon, lat = present[in_bounds], lon[in_bounds], lat[in_bounds]
+
+    zones = utm_zones(lon, lat)
+    south = lat < 0
+    zone_groups = [
+        (present[(zones == zone) & (south == is_south)], utm_transformer(zone, is_south))
+        for zone, is_south in set(zip(zones.tolist(), south.tolist()))
+    ]
+    return out_of_bounds, zone_groups
+
+def utm_zones(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    zones = np.floor((lon + 180.0) / 6.0).astype(int) % 60 + 1
+    # south-west Norway and Svalbard use widened zones
+    norway = (56.0 <= lat) & (lat < 64.0) & (3.0 <= lon) & (lon < 12.0)
+    svalbard = (72.0 <= lat) & (lat <= 84.0) & (0.0 <= lon) & (lon < 42.0)
+    zones = np.where(norway, 32, zones)
+    return np.where(
+        svalbard, np.select([lon < 9.0, lon < 21.0, lon < 33.0], [31, 33, 35], 37), zones
+    )
+
 def geom_to_utm(geom: Polygon) -> Polygon:
     if geom.is_empty:
         return geom
-    lon, lat = geom.centroid.x, geom.centroid.y
-    if not -80.0 <= lat <= 84.0:
-        # change/mirror XY-coordinates?
-        geom = Polygon()
-        return geom
-    if not -180.0 <= lon <= 180.0:
+    project = geom_utm_transformer(geom)
+    if project is None:
         # change/mirror XY-coordinates?
-        geom = Polygon()
-        return geom
-    _, _, zone, _ = utm.from_latlon(lat, lon)
-    project = Transformer.from_crs(
+        return Polygon()
+    return transform_coordinates(geom, project)
+
+def transform_coordinates(geoms, project: Transformer, direction=TransformDirection.FORWARD):
+    # hand the coordinate array to PROJ in a single call instead of going
+    # through a Python callback per ring
+    return shapely.transform(
+        geoms,
+        lambda coords: np.column_stack(
+            project.transform(coords[:, 0], coords[:, 1], direction=direction)
+        ),
+    )
+
+@lru_cache(maxsize=128)
+def utm_transformer(zone: int, south: bool) -> Transformer:
+    # building a Transformer sets up a full PROJ pipeline, so build it once
+    # per UTM zone and reuse it for every geometry in that zone
+    return Transformer.from_crs(
         CRS("EPSG:4326"),
-        CRS.from_dict({"proj": "utm", "zone": zone, "south": lat < 0}),
+        CRS.from_dict({"proj": "utm", "zone": zone, "south": south}),
         always_xy=True,
-    ).transform
-    return transform(project, geom)
+    )
 
-@log_step
-def validate_country(
-    gdf: gpd.GeoDataFrame, country_code: str = COUNTRY_ISO3
-) -> gpd.GeoDataFrame:
-    country_path = "/Users/joy/Downloads/Rabobank_ACORN_Initiative/AcornGT/datasets/world-administrative-boundaries/world-administrative-boundaries.shp"
-    gdf_countries = (
-        gpd.read_file(country_path)
+def geom_utm_transformer(geom: Polygon) -> Optional[Transformer]:
+    lon, lat = geom.centroid.x, geom.centroid.y
+    if not -80.0 <= lat <= 84.0:
+        return None
+    if not -180.0 <= lon <= 180.0:
+        return None
+    return utm_transformer(int(utm_zones(lon, lat)), lat < 0)
+
+@lru_cache(maxsize=8)
+def read_country_buffer(path: str, country_code: str) -> gpd.GeoDataFrame:
+    # the country outline buffered by 10 km; cached per country, so callers
+    # share the frame and must not modify it
+    return (
+        gpd.read_file(path, engine="pyogrio", use_arrow=True)
         .to_crs("EPSG:4326")
         .pipe(lambda x: x[x.iso3 == country_code])
         .pipe(lambda x: wgs_to_utm(x))[["geometry", "iso3"]]
@@ -129,12 +199,20 @@ def validate_country(
     )
 
 
+@log_step
+def validate_country(
+    gdf: gpd.GeoDataFrame, country_code: str = COUNTRY_ISO3
+) -> gpd.GeoDataFrame:
+    country_path = "/Users/joy/Downloads/Rabobank_ACORN_Initiative/AcornGT/datasets/world-administrative-boundaries/world-administrative-boundaries.shp"
+    gdf_countries = read_country_buffer(country_path, country_code)
+
+
     gdf["overlapping_countries"] = (
         gdf.reset_index()
         .pipe(lambda x: x.sjoin(gdf_countries, how="left"))
         .astype({"iso3": "str"})
         .groupby("index")["iso3"]
-        .apply(lambda x: ";".join(x))
+        .agg(";".join)
     )
     gdf["in_country"] = country_code == gdf["overlapping_countries"]
 
@@ -205,42 +283,46 @@ def validate_overlap(
     buffer: float = -5,
     filter: Callable[[gpd.GeoDataFrame], gpd.GeoDataFrame] = lambda x: x,
 ) -> gpd.GeoDataFrame:
-    df_overlap = (
+    candidates = (
         gdf
         # .pipe(lambda x: x[x.valid])
         .pipe(lambda x: wgs_to_utm(x))
         .assign(geometry=lambda x: x.geometry.buffer(buffer))
-        .to_crs("EPSG:4326")
         .pipe(filter)
-        .pipe(calculate_area)
-        .pipe(lambda x: x.overlay(x))
-        .pipe(lambda x: x[x[f"{id_column}_1"] != x[f"{id_column}_2"]])
-        .pipe(calculate_area)
-        .assign(
-            min_area=lambda x: x[["area_m2_1", "area_m2_2"]].min(axis=1),
-            overlay_ratio=lambda x: x.area_m2 / x.min_area,
-            overlap=lambda x: min_overlap < x.overlay_ratio.to_numpy(),
-        )
-        .pipe(lambda x: x[x.overlap])
     )
-
-    df_overlap_ids = (
-        df_overlap.groupby(f"{id_column}_1")[f"{id_column}_2"]
-        .apply(lambda x: ";".join(x))
-        .reset_index()
-        .rename(columns={f"{id_column}_1": id_column, f"{id_column}_2": "overlap_ids"})
+    # stay in the frame's UTM zone, so the areas are planar and nothing has to
+    # be projected back; only intersect the pairs whose envelopes meet
+    # instead of overlaying the whole frame with itself
+    geoms = candidates.geometry.to_numpy()
+    ids = candidates[id_column].to_numpy()
+    areas = shapely.area(geoms)
+    left, right = shapely.STRtree(geoms).query(geoms, predicate="intersects")
+    order = np.lexsort((right, left))
+    left, right = left[order], right[order]
+    other = ids[left] != ids[right]
+    left, right = left[other], right[other]
+    overlap_m2 = shapely.area(shapely.intersection(geoms[left], geoms[right]))
+    df_overlap = (
+        pd.DataFrame(
+            {
+                f"{id_column}_1": ids[left],
+                f"{id_column}_2": ids[right],
+                "overlay_ratio": overlap_m2 / np.minimum(areas[left], areas[right]),
+            }
+        )
+        .pipe(lambda x: x[min_overlap < x.overlay_ratio.to_numpy()])
     )
 
-    df_overlap_max = (
+    df_overlap_all = (
         df_overlap.groupby(f"{id_column}_1")
-        .agg({"overlay_ratio": ["max"]})
-        .droplevel(axis=1, level=0)
-        .reset_index()
-        .rename(columns={f"{id_column}_1": id_column, "max": "percentage_overlap"})
+        .agg(
+            overlap_ids=(f"{id_column}_2", ";".join),
+            percentage_overlap=("overlay_ratio", "max"),
+        )
         .round(decimals=2)
+        .reset_index()
+        .rename(columns={f"{id_column}_1": id_column})
     )
-
-    df_overlap_all = df_overlap_ids.merge(df_overlap_max, on=id_column, how="left")
     return gdf.merge(df_overlap_all, how="left").assign(
         overlap_ids=lambda x: x.overlap_ids.fillna(""),
     )
@@ -250,7 +332,7 @@ def to_geojson(geom: Polygon, id: str = "plot_id") -> Optional[str]:
     if geom is None:
         return None
     else:
-        return json.dumps(
+        return orjson.dumps(
             {
                 "type": "FeatureCollection",
                 "features": [
@@ -261,17 +343,30 @@ def to_geojson(geom: Polygon, id: str = "plot_id") -> Optional[str]:
                     }
                 ],
             }
-        )
-    
-def round_coordinates(geom, ndigits=2):
-    def _round_coords(x, y, z=None):
-        x = round(x, ndigits)
-        y = round(y, ndigits)
-        if z is not None:
-            z = round(z, ndigits)
-        return [c for c in (x, y, z) if c is not None]
+        ).decode()
+
+
+def to_geojson_column(gdf: gpd.GeoDataFrame, id_column: str) -> list:
+    """GeoJSON string per row, same content as to_geojson. The rounding and the
+    geometry encoding run once over the whole column; only the small feature
+    wrapper is put together per row."""
+    geoms = gdf.geometry.to_numpy()
+    geometries = shapely.to_geojson(round_coordinates(geoms, 7))
+    # shapely writes an empty polygon as "coordinates":[[]], where mapping
+    # (and so to_geojson) gives []; keep the mapping output for those
+    empty = np.flatnonzero(shapely.is_empty(geoms))
+    geometries[empty] = [orjson.dumps(mapping(geom)).decode() for geom in geoms[empty]]
+    return [
+        None
+        if geometry is None
+        else '{"type":"FeatureCollection","features":[{"type":"Feature","properties":'
+        f'{orjson.dumps({"id": id}).decode()},"geometry":{geometry}}}]}}'
+        for geometry, id in zip(geometries, gdf[id_column])
+    ]
 
-    return transform(_round_coords, geom)
+def round_coordinates(geom, ndigits=2):
+    """Round all coordinates of a geometry (or an array of geometries) at once."""
+    return shapely.transform(geom, lambda coords: np.round(coords, ndigits))
 
 @log_step
 def validate_duplicate_id(gdf: GeoDataFrame, id_column: str) -> GeoDataFrame:
@@ -279,104 +374,88 @@ def validate_duplicate_id(gdf: GeoDataFrame, id_column: str) -> GeoDataFrame:
     return gdf
 
 
-def collect_reasons_subplot(row: pd.Series) -> str:
-    if row.geometry is None:
-        return "Geometry missing"
-    if row.geometry.is_empty:
-        return "Empty geometry"
-    if not row.geometry.is_valid:
-        return "Invalid geometry"
-    reasons = []
-    if "overlap_ids" in row.index.tolist():
-        if len(row.overlap_ids) > 0:
-            reasons.append("Overlapping polygons")
-    if row.duplicate_id:
-        reasons.append("Duplicate plot id")
-    if not row.in_country:
-        reasons.append("Boundary not in country")
-    # if np.isnan(row.above_ground_biomass):
-    #     reasons.append("Plot has tree(s) with unknown biomass")
-    if not row.in_radius:
-        reasons.append("Plot outside of radius")
-    if row.area_m2 < MIN_SUBPLOT_AREA_SIZE:
-        reasons.append("Plot too small")
-    if MAX_SUBPLOT_AREA_SIZE < row.area_m2:
-        reasons.append("Plot too big")
-    if row.nr_vertices_too_small:
-        reasons.append("Nr vertices <= {}".format(3))
-    # if row.length_width_ratio_too_big:
-    #     reasons.append("Plot seems to long")
-    if row.protruding_ratio_too_big:
-        reasons.append("Plot is protruding")
-
-    return ";".join(reasons)
+def collect_reasons(gdf: gpd.GeoDataFrame, min_area: float, max_area: float) -> pd.Series:
+    # build every check as a boolean column and join the failed reasons
+    # column by column, instead of evaluating the checks row by row
+    geoms = gdf.geometry.to_numpy()
+    geometry_reason = np.select(
+        [shapely.is_missing(geoms), shapely.is_empty(geoms), ~shapely.is_valid(geoms)],
+        ["Geometry missing", "Empty geometry", "Invalid geometry"],
+        default="",
+    )
+    if "overlap_ids" in gdf:
+        overlapping = gdf.overlap_ids.fillna("").str.len() > 0
+    else:
+        overlapping = pd.Series(False, index=gdf.index)
+    checks = (
+        (overlapping, "Overlapping polygons"),
+        (gdf.duplicate_id.astype(bool), "Duplicate plot id"),
+        (~gdf.in_country.astype(bool), "Boundary not in country"),
+        # (np.isnan(gdf.above_ground_biomass), "Plot has tree(s) with unknown biomass"),
+        (~gdf.in_radius.astype(bool), "Plot outside of radius"),
+        (gdf.area_m2 < min_area, "Plot too small"),
+        (max_area < gdf.area_m2, "Plot too big"),
+        (gdf.nr_vertices_too_small.astype(bool), "Nr vertices <= {}".format(3)),
+        # (gdf.length_width_ratio_too_big.astype(bool), "Plot seems to long"),
+        (gdf.protruding_ratio_too_big.astype(bool), "Plot is protruding"),
+    )
+    reasons = pd.Series("", index=gdf.index)
+    for failed, reason in checks:
+        reasons += np.where(failed.to_numpy(), reason + ";", "")
+    return reasons.str.rstrip(";").where(geometry_reason == "", geometry_reason)
+
+
+def collect_reasons_subplot(gdf: gpd.GeoDataFrame) -> pd.Series:
+    return collect_reasons(gdf, MIN_SUBPLOT_AREA_SIZE, MAX_SUBPLOT_AREA_SIZE)
 
 # Plot
-def collect_reasons_plot(row: pd.Series) -> str:
-    if row.geometry is None:
-        return "Geometry missing"
-    if row.geometry.is_empty:
-        return "Empty geometry"
-    if not row.geometry.is_valid:
-        return "Invalid geometry"
-    reasons = []
-    if "overlap_ids" in row.index.tolist():
-        if len(row.overlap_ids) > 0:
-            reasons.append("Overlapping polygons")
-    if row.duplicate_id:
-        reasons.append("Duplicate plot id")
-    if not row.in_country:
-        reasons.append("Boundary not in country")
-    # if np.isnan(row.above_ground_biomass):
-    #     reasons.append("Plot has tree(s) with unknown biomass")
-    if not row.in_radius:
-        reasons.append("Plot outside of radius")
-    if row.area_m2 < MIN_GT_PLOT_AREA_SIZE:
-        reasons.append("Plot too small")
-    if MAX_GT_PLOT_AREA_SIZE < row.area_m2:
-        reasons.append("Plot too big")
-    if row.nr_vertices_too_small:
-        reasons.append("Nr vertices <= {}".format(3))
-    # if row.length_width_ratio_too_big:
-    #     reasons.append("Plot seems to long")
-    if row.protruding_ratio_too_big:
-        reasons.append("Plot is protruding")
-
-    return ";".join(reasons)
+def collect_reasons_plot(gdf: gpd.GeoDataFrame) -> pd.Series:
+    return collect_reasons(gdf, MIN_GT_PLOT_AREA_SIZE, MAX_GT_PLOT_AREA_SIZE)
+
+
+# Every geojson string is written by to_geojson / to_geojson_column, which
+# always start a non-empty feature collection like this
+GEOJSON_FEATURE_PREFIX = '{"type":"FeatureCollection","features":[{"type":"Feature",'
+
+
+def validate_geometry_for_export(df, name):
+    """Keep the rows that have a geojson feature to export. Checking the prefix
+    the serialisers write is enough, so the coordinates are never decoded."""
+    geojsons = df['geojson'].to_numpy() if 'geojson' in df else np.full(len(df), None)
+    keep = np.fromiter(
+        (isinstance(geojson, str) and geojson.startswith(GEOJSON_FEATURE_PREFIX) for geojson in geojsons),
+        dtype=bool,
+        count=len(geojsons),
+    )
+    for idx, geojson in zip(df.index[~keep], geojsons[~keep]):
+        problem = "missing geojson" if geojson is None else "empty or invalid geojson"
+        logger.warning(f"Bad {name} geojson at index {idx}: {problem}")
+
+    logger.info(f"Found {int((~keep).sum())} bad {name} shapes out of {len(df)} total")
+    return df[keep] if keep.any() else pd.DataFrame()
+
+
+def log_invalid_records(df, name, id_column):
+    """Log the reasons of every invalid record and, from the same pass, how
+    often each individual reason occurs."""
+    ids = df[id_column] if id_column in df else repeat("unknown")
+    reasons = df["reasons"] if "reasons" in df else repeat("unknown reasons")
+    reason_counts = Counter()
+    for record_id, record_reasons in zip(ids, reasons):
+        logger.info(f"Invalid {name} {record_id}: {record_reasons}")
+        if isinstance(record_reasons, str):
+            reason_counts.update(
+                reason for reason in map(str.strip, record_reasons.split(";")) if reason
+            )
+    logger.info(f"Invalid {name} reasons: {dict(reason_counts.most_common())}")
 
 
 def export_plots(df_plots, output_dir):
     """Export plots to GeoJSON files"""
     try:
         # Split into valid and invalid plots
-        df_valid = df_plots[df_plots['valid']].copy()
-        df_invalid = df_plots[~df_plots['valid']].copy()
-        
-        # Validate geometry before export
-        def validate_geometry_for_export(df, name):
-            bad_shapes = 0
-            valid_records = []
-            
-            for idx, row in df.iterrows():
-                try:
-                    # Check if geojson exists and is valid
-                    if 'geojson' in row and row.geojson is not None:
-                        # Try to parse the geojson to validate it
-                        geojson_data = json.loads(row.geojson)
-                        if geojson_data and 'features' in geojson_data and len(geojson_data['features']) > 0:
-                            valid_records.append(row)
-                        else:
-                            bad_shapes += 1
-                            logger.warning(f"Bad {name} geojson at index {idx}: empty or invalid geojson")
-                    else:
-                        bad_shapes += 1
-                        logger.warning(f"Bad {name} geojson at index {idx}: missing geojson")
-                except Exception as e:
-                    bad_shapes += 1
-                    logger.warning(f"Bad {name} geojson at index {idx}: {str(e)}")
-            
-            logger.info(f"Found {bad_shapes} bad {name} shapes out of {len(df)} total")
-            return pd.DataFrame(valid_records) if valid_records else pd.DataFrame()
+        df_valid = df_plots[df_plots['valid']]
+        df_invalid = df_plots[~df_plots['valid']]
         
         # Validate and filter valid plots
         df_valid_clean = validate_geometry_for_export(df_valid, "plot")
@@ -387,14 +466,7 @@ def export_plots(df_plots, output_dir):
         # Log problematic records before export
         if not df_invalid.empty:
             logger.info(f"Found {len(df_invalid)} invalid plots")
-            for idx, row in df_invalid.iterrows():
-                try:
-                    # Try to access geojson to check if it's valid
-                    _ = row.geojson
-                    logger.info(f"Invalid plot {row.get('plot_id', 'unknown')}: {row.get('reasons', 'unknown reasons')}")
-                except Exception as e:
-                    logger.error(f"Problematic plot record at index {idx}: {str(e)}")
-                    logger.error(f"Record data: {row.to_dict()}")
+            log_invalid_records(df_invalid, "plot", "plot_id")
         
         # Export valid plots
         if not df_valid_clean.empty:
@@ -440,34 +512,8 @@ def export_subplots(df_subplots, output_dir):
     """Export subplots to GeoJSON files"""
     try:
         # Split into valid and invalid subplots
-        df_valid = df_subplots[df_subplots['valid']].copy()
-        df_invalid = df_subplots[~df_subplots['valid']].copy()
-        
-        # Validate geometry before export
-        def validate_geometry_for_export(df, name):
-            bad_shapes = 0
-            valid_records = []
-            
-            for idx, row in df.iterrows():
-                try:
-                    # Check if geojson exists and is valid
-                    if 'geojson' in row and row.geojson is not None:
-                        # Try to parse the geojson to validate it
-                        geojson_data = json.loads(row.geojson)
-                        if geojson_data and 'features' in geojson_data and len(geojson_data['features']) > 0:
-                            valid_records.append(row)
-                        else:
-                            bad_shapes += 1
-                            logger.warning(f"Bad {name} geojson at index {idx}: empty or invalid geojson")
-                    else:
-                        bad_shapes += 1
-                        logger.warning(f"Bad {name} geojson at index {idx}: missing geojson")
-                except Exception as e:
-                    bad_shapes += 1
-                    logger.warning(f"Bad {name} geojson at index {idx}: {str(e)}")
-            
-            logger.info(f"Found {bad_shapes} bad {name} shapes out of {len(df)} total")
-            return pd.DataFrame(valid_records) if valid_records else pd.DataFrame()
+        df_valid = df_subplots[df_subplots['valid']]
+        df_invalid = df_subplots[~df_subplots['valid']]
         
         # Validate and filter valid subplots
         df_valid_clean = validate_geometry_for_export(df_valid, "subplot")
@@ -478,14 +524,7 @@ def export_subplots(df_subplots, output_dir):
         # Log problematic records before export
         if not df_invalid.empty:
             logger.info(f"Found {len(df_invalid)} invalid subplots")
-            for idx, row in df_invalid.iterrows():
-                try:
-                    # Try to access geojson to check if it's valid
-                    _ = row.geojson
-                    logger.info(f"Invalid subplot {row.get('subplot_id', 'unknown')}: {row.get('reasons', 'unknown reasons')}")
-                except Exception as e:
-                    logger.error(f"Problematic subplot record at index {idx}: {str(e)}")
-                    logger.error(f"Record data: {row.to_dict()}")
+            log_invalid_records(df_invalid, "subplot", "subplot_id")
         
         # Export valid subplots
         if not df_valid_clean.empty:
@@ -529,23 +568,30 @@ def export_subplots(df_subplots, output_dir):
 
 @log_step
 def fix_geometry(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-    gdf["geometry"] = gdf.geometry.apply(remove_duplicate_vertices)
-    valid = gdf.is_valid.sum()
-    gdf["geometry"] = gdf.geometry.apply(fix_self_intersecting_square)
-    gdf["geometry"] = gdf.geometry.apply(fix_with_orient)
-    gdf["geometry"] = gdf.geometry.apply(fix_with_rewind)
-    gdf["geometry"] = gdf.geometry.apply(fix_with_zero_buffer)
-    gdf["geometry"] = gdf.geometry.apply(simplify_geometry, tolerance=0.1)
-    print(f"Fixed {gdf.is_valid.sum() - valid} polygons")
-    empty = gdf.is_empty.sum()
-    gdf["geometry"] = gdf.geometry.apply(replace_area_zero)
-    gdf["geometry"] = gdf.geometry.apply(replace_none_geometries)
-    gdf["geometry"] = gdf.geometry.apply(replace_out_of_bound_geometries)
-    gdf["geometry"] = gdf.geometry.apply(replace_invalid)
-    print(f"Replaced {gdf.is_empty.sum() - empty} polygons with empty polygons")
-
+    # run the fixes over the raw geometry array and build the GeoSeries once at
+    # the end, instead of constructing a new GeoSeries after every step
+    geoms = map_geometries(remove_duplicate_vertices, gdf.geometry.to_numpy())
+    valid = shapely.is_valid(geoms).sum()
+    geoms = map_geometries(fix_self_intersecting_square, geoms)
+    geoms = map_geometries(fix_with_orient, geoms)
+    geoms = map_geometries(fix_with_rewind, geoms)
+    geoms = map_geometries(fix_with_zero_buffer, geoms)
+    print(f"Fixed {shapely.is_valid(geoms).sum() - valid} polygons")
+    empty = shapely.is_empty(geoms).sum()
+    geoms = map_geometries(replace_area_zero, geoms)
+    geoms = map_geometries(replace_none_geometries, geoms)
+    geoms = map_geometries(replace_out_of_bound_geometries, geoms)
+    geoms = map_geometries(replace_invalid, geoms)
+    print(f"Replaced {shapely.is_empty(geoms).sum() - empty} polygons with empty polygons")
+
+    gdf["geometry"] = gpd.GeoSeries(geoms, index=gdf.index, crs=gdf.crs)
     return gdf
 
+def map_geometries(func: Callable, geoms: np.ndarray, **kwargs) -> np.ndarray:
+    out = np.empty(len(geoms), dtype=object)
+    out[:] = [func(geom, **kwargs) for geom in geoms]
+    return out
+
 def remove_duplicate_vertices(geom: Polygon) -> Polygon:
     if geom.is_empty:
         return Polygon()
@@ -590,7 +636,8 @@ def fix_with_rewind(geom: Polygon) -> Polygon:
         return geom
     if geom.is_valid:
         return geom
-    new_geom = shape(json.loads(rewind(json.dumps(mapping(geom)))))
+    # rewind needs mutable lists, so round-trip the tuple-based mapping once
+    new_geom = shape(rewind(orjson.loads(orjson.dumps(mapping(geom)))))
     if new_geom.is_valid:
         return new_geom
     return geom
@@ -600,46 +647,23 @@ def fix_with_zero_buffer(geom: Polygon) -> Polygon:
         return None
     elif geom.is_valid:
         return geom
+    # make_valid keeps every vertex, so try it first; like the buffer(0)
+    # repair it is only accepted when it keeps the area of the original
+    new_geom = shapely.make_valid(geom)
+    if new_geom.geom_type == "Polygon" and keeps_area(geom, new_geom):
+        return new_geom
     new_geom = geom.buffer(0)
+    if keeps_area(geom, new_geom):
+        return new_geom
+    return geom
+
+def keeps_area(geom: Polygon, new_geom: Polygon) -> bool:
     if geom.area > 0:
         ratio = new_geom.area / geom.area
     else:
         ratio = 10000
-    if 0.995 <= ratio and ratio < 1.005:
-        return new_geom
-    return geom
-
-
-def simplify_geometry(geom, tolerance: float = 0.05):
-    if geom.is_empty:
-        return geom
-    utm_geom, utm_crs_dict = geom_to_utm_with_crs(geom)
-    utm_geom_s = utm_geom.simplify(tolerance, preserve_topology=True)
-    project = Transformer.from_crs(
-        utm_crs_dict, CRS("EPSG:4326"), always_xy=True
-    ).transform
-    wgs_geom = transform(project, utm_geom_s)
-    if ~wgs_geom.is_valid:
-        return geom
-    return wgs_geom
+    return 0.995 <= ratio and ratio < 1.005
 
-def geom_to_utm_with_crs(geom: Polygon) -> Polygon:
-    if geom.is_empty:
-        return geom
-    lon, lat = geom.centroid.x, geom.centroid.y
-    if not -80.0 <= lat <= 84.0:
-        # change/mirror XY-coordinates?
-        geom = Polygon()
-        return geom
-    if not -180.0 <= lon <= 180.0:
-        # change/mirror XY-coordinates?
-        geom = Polygon()
-        return geom
-    _, _, zone, _ = utm.from_latlon(lat, lon)
-    crs_dict = CRS.from_dict({"proj": "utm", "zone": zone, "south": lat < 0})
-    project = Transformer.from_crs(CRS("EPSG:4326"), crs_dict, always_xy=True).transform
-    geom_utm = transform(project, geom)
-    return geom_utm, crs_dict
 
 def replace_area_zero(geom: Polygon) -> Polygon:
     if geom is None:
@@ -675,20 +699,22 @@ def validate_length_width_ratio(gdf: gpd.GeoDataFrame, threshold) -> gpd.GeoData
     )
 
 def add_length_width_ratio(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-    gdf["length_width_ratio"] = gdf.geometry.apply(geom_to_utm).apply(
-        length_width_ratio
+    rectangles = shapely.minimum_rotated_rectangle(
+        geoms_to_utm(gdf.geometry.to_numpy())
     )
+    gdf["length_width_ratio"] = map_geometries(rectangle_length_width_ratio, rectangles)
     return gdf
 
 def length_width_ratio(geom: Polygon) -> Optional[float]:
     if geom.is_empty:
         return None
-    mbb = geom.minimum_rotated_rectangle
-    x, y = mbb.exterior.coords.xy
-    edge_length = (
-        Point(x[0], y[0]).distance(Point(x[1], y[1])),
-        Point(x[1], y[1]).distance(Point(x[2], y[2])),
-    )
+    return rectangle_length_width_ratio(geom.minimum_rotated_rectangle)
+
+def rectangle_length_width_ratio(mbb: Polygon) -> Optional[float]:
+    if mbb is None or mbb.is_empty:
+        return None
+    (x0, y0), (x1, y1), (x2, y2) = shapely.get_coordinates(mbb)[:3]
+    edge_length = (math.hypot(x1 - x0, y1 - y0), math.hypot(x2 - x1, y2 - y1))
     ratio = max(edge_length) / min(edge_length)
     return ratio
 
@@ -699,14 +725,21 @@ def validate_nr_vertices(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     )
 
 def number_of_vertices_per_polygon(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-    gdf["nr_vertices"] = gdf.geometry.apply(nr_vertices)
+    gdf["nr_vertices"] = vertex_counts(gdf.geometry.to_numpy())
     return gdf
 
+def vertex_counts(geoms: np.ndarray) -> np.ndarray:
+    # same semantics as nr_vertices: 0 for empty geometries, the exterior
+    # coordinate count for polygons and missing for anything else
+    counts = shapely.get_num_coordinates(shapely.get_exterior_ring(geoms))
+    polygon = shapely.get_type_id(geoms) == shapely.GeometryType.POLYGON
+    return pd.Series(counts).where(polygon | shapely.is_empty(geoms)).to_numpy()
+
 def nr_vertices(geom: Polygon) -> Optional[int]:
     if geom.is_empty:
         return 0
     elif type(geom) == Polygon:
-        return len(geom.exterior.coords.xy[0])
+        return int(shapely.get_num_coordinates(geom.exterior))
     return None
 
 @log_step
@@ -716,18 +749,17 @@ def validate_protruding_ratio(gdf: gpd.GeoDataFrame, threshold) -> gpd.GeoDataFr
     )
 
 def add_protruding_ratio(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-    gdf_shapes = (
-        gdf[~gdf.geometry.isna()]
-        .pipe(calculate_area)
-        .pipe(calculate_minimum_rotated_rectangle)
-        .assign(mrr_ratio=lambda x: x.minimum_rotated_rectangle_m2 / x.area_m2)
-        .drop(columns=["area_m2", "minimum_rotated_rectangle_m2"])
+    # project once and measure both the polygon and its rectangle from it
+    gdf_shapes = gdf[~gdf.geometry.isna()]
+    utm_geoms = geoms_to_utm(gdf_shapes.geometry.to_crs("EPSG:4326").to_numpy())
+    rectangles = shapely.minimum_rotated_rectangle(utm_geoms)
+    return gdf_shapes.assign(
+        mrr_ratio=shapely.area(rectangles) / shapely.area(utm_geoms)
     )
-    return gdf_shapes
 
 def calculate_minimum_rotated_rectangle(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-    gdf["minimum_rotated_rectangle_m2"] = gdf.geometry.apply(
-        lambda x: geom_to_utm(x).minimum_rotated_rectangle.area
+    gdf["minimum_rotated_rectangle_m2"] = shapely.area(
+        shapely.minimum_rotated_rectangle(geoms_to_utm(gdf.geometry.to_numpy()))
     )
     return gdf
 
@@ -742,8 +774,12 @@ def all_points_in_radius(geom: Polygon, radius: float) -> Any:
         if geom.type == "MultiPolygon":
             geom = geom.geoms[0]
         geom_utm = geom_to_utm(geom)
-        circle = geom_utm.centroid.buffer(radius)
-        return circle.covers(geom_utm)
+        if geom_utm.is_empty:
+            return False
+        # a circle is convex, so it covers the polygon exactly when it covers
+        # every vertex; no need to buffer the centroid and run covers
+        offsets = shapely.get_coordinates(geom_utm) - shapely.get_coordinates(geom_utm.centroid)
+        return bool((offsets**2).sum(axis=1).max() <= radius**2)
     return None
 
 def create_gt_plotid(row):
@@ -754,6 +790,20 @@ def create_gt_plotid(row):
         f"{country_code}_{partner}_{collection_date}_"
         f"{row.enumerator_id}_{str(row.name + 1)}"
     )
+
+def create_gt_plotids(df: pd.DataFrame) -> pd.Series:
+    # create_gt_plotid for the whole frame at once, formatting the dates with
+    # dt.strftime instead of per row
+    prefix = f"{COUNTRY_ISO3}_{PARTNER.replace(' ', '')}_"
+    row_numbers = pd.Series(df.index + 1, index=df.index).astype(str)
+    return (
+        prefix
+        + df["starttime"].dt.strftime("%Y%m%d")
+        + "_"
+        + df["enumerator_id"].astype(str)
+        + "_"
+        + row_numbers
+    )
 # START 
 # def geom_from_scto_str(pd_row, column, accuracy_m):
 #     polygon_string = pd_row[column]
@@ -906,6 +956,48 @@ def geom_from_scto_str(pd_row, column, accuracy_m):
     return geom
 
 
+def geoms_from_scto_str(df: pd.DataFrame, column: str, accuracy_m) -> np.ndarray:
+    """Column-wise geom_from_scto_str: all vertices are parsed in one go and the
+    polygons are built with shapely's vectorised constructors. Rows that end up
+    empty for a reason worth reporting go through geom_from_scto_str for the
+    message."""
+    EXCEL_CELL_LIMIT = 32767
+
+    geoms = np.full(len(df), Polygon(), dtype=object)
+    polygon_strings = df[column].reset_index(drop=True).dropna()
+    if polygon_strings.empty:
+        return geoms
+
+    at_cell_limit = polygon_strings.str.len() == EXCEL_CELL_LIMIT
+    for pos in polygon_strings.index[at_cell_limit]:
+        geoms[pos] = geom_from_scto_str(df.iloc[pos], column, accuracy_m)
+    polygon_strings = polygon_strings[~at_cell_limit]
+
+    # One row per vertex, indexed by the position of the row it belongs to
+    vertices = polygon_strings.str.split(";").explode()
+    parts = (
+        vertices.str.strip().str.split(" ", expand=True).reindex(columns=range(4))
+    )
+    keep = (vertices.str.len() > 0) & (parts[3].astype(float) <= accuracy_m)
+
+    nr_kept = keep.groupby(level=0).sum()
+    nr_skipped = (~keep).groupby(level=0).sum()
+    enough_points = (nr_kept >= 3) & (nr_kept >= nr_skipped * 4)
+    for pos in enough_points.index[~enough_points]:
+        geoms[pos] = geom_from_scto_str(df.iloc[pos], column, accuracy_m)
+
+    keep = keep.to_numpy() & enough_points.reindex(vertices.index).to_numpy()
+    if keep.any():
+        rows, ring_indices = np.unique(vertices.index[keep], return_inverse=True)
+        coords = np.column_stack(
+            [parts[1][keep].astype(float), parts[0][keep].astype(float)]
+        )
+        geoms[rows] = shapely.polygons(
+            shapely.linearrings(coords, indices=ring_indices)
+        )
+    return geoms
+
+
 
 
 
@@ -929,11 +1021,11 @@ def export_plots(df: pd.DataFrame, dir_path: Path) -> None:
                      'reasons', 'valid', 'geojson']
 
     # df.to_excel(backup_dir / f"plots_{TIMESTAMP}.xlsx", index=False)
-    df.to_excel(ground_truth_dir / "plots.xlsx", index=False)
+    df.to_excel(ground_truth_dir / "plots.xlsx", index=False, engine="xlsxwriter")
 
     df_invalid = df[~df.valid]
     print(f"Number of invalid plots: {df_invalid.shape[0]}")
-    df_invalid.to_excel(ground_truth_dir / "plots_invalid.xlsx", index=False)
+    df_invalid.to_excel(ground_truth_dir / "plots_invalid.xlsx", index=False, engine="xlsxwriter")
     
     if df_invalid.shape[0] > 0:
        df_invalid.drop(columns="geojson").to_file(
@@ -944,7 +1036,7 @@ def export_plots(df: pd.DataFrame, dir_path: Path) -> None:
 
     df_valid = df[df.valid]
     print(f"Number of valid plots: {df_valid.shape[0]}")
-    df_valid.to_excel(ground_truth_dir / "plots_valid.xlsx", index=False)
+    df_valid.to_excel(ground_truth_dir / "plots_valid.xlsx", index=False, engine="xlsxwriter")
     if df_valid.shape[0] > 0:
         df_valid.drop(columns="geojson").to_file(
             ground_truth_dir / "plots_valid.geojson",
@@ -962,21 +1054,14 @@ def generate_country_dropdown_json():
     if os.path.exists(out_path):
         print(f"{out_path} already exists. Skipping generation.")
         return
-    df = gpd.read_file(shp_path)
-    # Use the columns you provided: 'iso3' and 'name'
-    dropdown_list = [
-        {"iso3": row["iso3"], "name": row["name"]}
-        for _, row in df.iterrows()
-        if pd.notnull(row["iso3"]) and pd.notnull(row["name"])
-    ]
-    # Remove duplicates (some shapefiles have multiple polygons per country)
-    seen = set()
-    unique_list = []
-    for item in dropdown_list:
-        key = (item["iso3"], item["name"])
-        if key not in seen:
-            unique_list.append(item)
-            seen.add(key)
+    # Use the columns you provided: 'iso3' and 'name'; the geometries are not needed
+    df = gpd.read_file(
+        shp_path, engine="pyogrio", use_arrow=True, columns=["iso3", "name"], read_geometry=False
+    ).dropna(subset=["iso3", "name"])
+    # Remove duplicates (some shapefiles have multiple polygons per country);
+    # dict keys keep the first occurrence of each pair in file order
+    unique_countries = dict.fromkeys(zip(df["iso3"], df["name"]))
+    unique_list = [{"iso3": iso3, "name": name} for iso3, name in unique_countries]
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(unique_list, f, ensure_ascii=False, indent=2)
     print(f"Wrote {len(unique_list)} country options to {out_path}")
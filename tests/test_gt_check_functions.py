@@ -0,0 +1,37 @@
+import geopandas as gpd
+from shapely.geometry import Polygon
+
+from gt_check_functions import fix_with_zero_buffer, to_geojson, to_geojson_column
+
+# a ~110 m square with a spike from the top edge that crosses the bottom edge
+SPIKED_SQUARE = Polygon(
+    [
+        (30.0, 0.0), (30.001, 0.0), (30.001, 0.001), (30.0006, 0.001),
+        (30.0005, -0.0003), (30.0004, 0.001), (30.0, 0.001),
+    ]
+)
+
+
+def test_fix_with_zero_buffer_does_not_trim_spikes():
+    # a repair is only accepted when it keeps the area of the original, so
+    # a spiked plot is either left as it is (and flagged invalid later) or
+    # repaired without losing area
+    assert not SPIKED_SQUARE.is_valid
+
+    fixed = fix_with_zero_buffer(SPIKED_SQUARE)
+
+    ratio = fixed.area / SPIKED_SQUARE.area
+    assert fixed.equals(SPIKED_SQUARE) or 0.995 <= ratio < 1.005
+
+
+def test_to_geojson_column_matches_to_geojson_for_empty_polygons():
+    gdf = gpd.GeoDataFrame(
+        {"plot_id": ["empty", "spiked"]},
+        geometry=[Polygon(), SPIKED_SQUARE],
+        crs="EPSG:4326",
+    )
+
+    (empty, _) = to_geojson_column(gdf, "plot_id")
+
+    assert empty == to_geojson(Polygon(), "empty")
+    assert '"coordinates":[]' in empty